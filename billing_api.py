@@ -0,0 +1,254 @@
+import argparse
+import asyncio
+import json
+from datetime import date
+
+from billing_engine import BillingEngine, load_menu
+from money import Money
+from receipt_printer import ReceiptRenderer, RECEIPT_PRINTER
+from sales_ledger import SalesLedger
+
+HOST = "127.0.0.1"
+PORT = 8080
+
+# Routes: (method, path pattern) -> handler name; {id} and {item} are path parameters
+ROUTES = [
+    ("GET", "/menu", "get_menu"),
+    ("GET", "/orders", "list_orders"),
+    ("POST", "/orders", "create_order"),
+    ("GET", "/orders/{id}", "get_order"),
+    ("DELETE", "/orders/{id}", "close_order"),
+    ("POST", "/orders/{id}/items", "add_item"),
+    ("DELETE", "/orders/{id}/items/{item}", "remove_item"),
+    ("POST", "/orders/{id}/checkout", "checkout"),
+    ("GET", "/reports/today", "report_today"),
+]
+
+STATUS_TEXT = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+def money_json(money):
+    return {"amount": f"{money}", "currency": money.currency}
+
+
+def invoice_json(invoice):
+    return {
+        "invoice_no": invoice["invoice_no"],
+        "number": invoice["number"],
+        "date": invoice["date"],
+        "lines": [{"name": name, "quantity": quantity, "price": money_json(price)}
+                  for name, quantity, price in invoice["lines"]],
+        "subtotal": money_json(invoice["subtotal"]),
+        "tax_label": invoice["tax_label"],
+        "tax": money_json(invoice["tax"]),
+        "total": money_json(invoice["total"]),
+    }
+
+
+class BillingAPI:
+    """A small JSON-over-HTTP/1.1 front end for a BillingEngine on asyncio.
+
+    Engine calls are in-memory and quick, so they run on the event loop;
+    checkout and reports touch SQLite and are moved to a worker thread.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.routes = [(method, pattern.strip("/").split("/"), handler)
+                       for method, pattern, handler in ROUTES]
+
+    def _match(self, method, path):
+        parts = path.split("?")[0].strip("/").split("/")
+        allowed = False
+        for route_method, pattern, handler in self.routes:
+            if len(pattern) != len(parts):
+                continue
+            params = {}
+            for expected, actual in zip(pattern, parts):
+                if expected.startswith("{"):
+                    params[expected[1:-1]] = actual
+                elif expected != actual:
+                    break
+            else:
+                if route_method == method:
+                    return getattr(self, handler), params
+                allowed = True
+        return None, 405 if allowed else 404
+
+    async def dispatch(self, method, path, body):
+        """(status, JSON-able payload) for one request"""
+        handler, params = self._match(method, path)
+        if handler is None:
+            return params, {"error": STATUS_TEXT[params]}
+        try:
+            if "id" in params:
+                params["id"] = int(params["id"])
+            return await handler(body, **params)
+        except (KeyError, ValueError) as e:
+            status = 404 if isinstance(e, KeyError) else 400
+            return status, {"error": str(e).strip("'\"")}
+
+    def order_json(self, order_id):
+        order = self.engine.order(order_id)
+        subtotal, tax, total = self.engine.totals(order_id)
+        return {
+            "order_id": order_id,
+            "items": [{"item_id": item_id, "name": self.engine.menu.name(item_id),
+                       "quantity": line["quantity"], "price": money_json(line["price"])}
+                      for item_id, line in order.items.items()],
+            "subtotal": money_json(subtotal),
+            "tax": money_json(tax),
+            "total": money_json(total),
+        }
+
+    # Handlers
+    async def get_menu(self, body):
+        menu = self.engine.menu
+        return 200, {category: [{"item_id": item_id, "name": name, "price": money_json(price)}
+                                for item_id, name, price in menu.category_items(category)]
+                     for category in menu.categories}
+
+    async def list_orders(self, body):
+        return 200, [self.order_json(order_id) for order_id in self.engine.open_orders()]
+
+    async def create_order(self, body):
+        return 201, self.order_json(self.engine.open_order())
+
+    async def get_order(self, body, id):
+        return 200, self.order_json(id)
+
+    async def close_order(self, body, id):
+        self.engine.close_order(id)
+        return 200, {"order_id": id, "closed": True}
+
+    async def add_item(self, body, id):
+        if "item_id" not in body:
+            raise ValueError("item_id is required")
+        self.engine.add_item(id, body["item_id"], body.get("quantity", 1))
+        return 200, self.order_json(id)
+
+    async def remove_item(self, body, id, item):
+        if not self.engine.remove_item(id, item):
+            raise KeyError(f"{item} is not in order {id}")
+        return 200, self.order_json(id)
+
+    async def checkout(self, body, id):
+        invoice = await asyncio.to_thread(self.engine.checkout, id)
+        return 200, invoice_json(invoice)
+
+    async def report_today(self, body):
+        ledger = self.engine.ledger
+        if ledger is None:
+            raise KeyError("No sales ledger configured")
+        today = date.today()
+        days, categories, items = await asyncio.to_thread(
+            lambda: (ledger.daily_sales(today, today), ledger.category_sales(today, today),
+                     ledger.item_sales(today, today)))
+        zero = Money.zero(self.engine.currency)
+        _, orders, subtotal, tax, total = days[0] if days else (None, 0, zero, zero, zero)
+        return 200, {
+            "date": today.isoformat(), "orders": orders,
+            "subtotal": money_json(subtotal), "tax": money_json(tax), "total": money_json(total),
+            "categories": [{"category": category, "quantity": quantity, "revenue": money_json(revenue)}
+                           for category, quantity, revenue in categories],
+            "items": [{"item_id": item_id, "name": name, "quantity": quantity, "revenue": money_json(revenue)}
+                      for item_id, name, quantity, revenue in items],
+        }
+
+    # HTTP
+    async def handle(self, reader, writer):
+        """Serve keep-alive requests on one connection until the client closes it"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                raw = await reader.readexactly(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else {}
+                    status, payload = await self.dispatch(method.upper(), path, body)
+                except json.JSONDecodeError:
+                    status, payload = 400, {"error": "Request body must be JSON"}
+                except Exception as e:
+                    status, payload = 500, {"error": str(e)}
+                data = json.dumps(payload).encode()
+                writer.write(f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                             f"Content-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=HOST, port=PORT):
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Billing API listening on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spice Garden billing engine")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="run the HTTP API")
+    serve.add_argument("--host", default=HOST)
+    serve.add_argument("--port", type=int, default=PORT)
+    commands.add_parser("menu", help="list menu item IDs and prices")
+    order = commands.add_parser("order", help="ring up an order, e.g. order butter-chicken garlic-naan=2")
+    order.add_argument("items", nargs="+", metavar="ITEM[=QTY]")
+    order.add_argument("--receipt", nargs="?", const="", metavar="PATH",
+                       help="also print a receipt (default: $RECEIPT_PRINTER or receipts.txt)")
+    report = commands.add_parser("report", help="sales report for a day (default today)")
+    report.add_argument("day", nargs="?", type=date.fromisoformat, default=None)
+    args = parser.parse_args()
+
+    engine = BillingEngine(load_menu(), ledger=SalesLedger())
+    if args.command == "serve":
+        asyncio.run(BillingAPI(engine).serve(args.host, args.port))
+    elif args.command == "menu":
+        for category in engine.menu.categories:
+            print(category)
+            for item_id, name, price in engine.menu.category_items(category):
+                print(f"  {item_id:<28} {name:<26} {price}")
+    elif args.command == "order":
+        order_id = engine.open_order()
+        try:
+            for spec in args.items:
+                item_id, _, quantity = spec.partition("=")
+                engine.add_item(order_id, item_id, int(quantity or 1))
+        except (KeyError, ValueError) as e:
+            parser.error(str(e).strip("'\""))
+        invoice = engine.checkout(order_id)
+        print(f"Invoice {invoice['number']}  {invoice['date']}")
+        for name, quantity, price in invoice["lines"]:
+            print(f"  {quantity} x {name:<26} {price * quantity}")
+        print(f"  Subtotal: {invoice['subtotal']}")
+        print(f"  {invoice['tax_label']}: {invoice['tax']}")
+        print(f"  Total: {invoice['total']}")
+        if args.receipt is not None:
+            target = args.receipt or RECEIPT_PRINTER
+            renderer = ReceiptRenderer(escpos=target is not None and target.startswith("/dev/"))
+            print(f"Receipt sent to {renderer.print_receipt(invoice, target)}")
+    elif args.command == "report":
+        day = args.day or date.today()
+        for _, orders, subtotal, tax, total in engine.ledger.daily_sales(day, day):
+            print(f"{day}: {orders} orders, subtotal {subtotal}, GST {tax}, total {total}")
+        for category, quantity, revenue in engine.ledger.category_sales(day, day):
+            print(f"  {category:<30} {quantity:>5} sold  {revenue}")
+
+
+if __name__ == "__main__":
+    main()
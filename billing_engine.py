@@ -0,0 +1,256 @@
+import itertools
+import os
+import threading
+from datetime import datetime
+
+from money import Money
+from menu_catalog import MenuCatalog
+from sales_ledger import invoice_label
+
+CURRENCY = "SGD"
+TAX_RATE = 0.09  # 9% GST for Singapore
+
+# Optional menu files; when present they replace the built-in menu
+MENU_JSON = "menu.json"
+MENU_CSV = "menu.csv"
+
+# Menu items with prices in SGD
+DEFAULT_MENU = {
+    "Starters": {
+        "Samosa (2 pcs)": 5.90,
+        "Paneer Tikka": 8.90,
+        "Chicken 65": 9.90,
+        "Vegetable Pakora": 6.50,
+        "Aloo Tikki": 5.50
+    },
+    "Main Course - Vegetarian": {
+        "Paneer Butter Masala": 15.90,
+        "Palak Paneer": 14.90,
+        "Chana Masala": 12.90,
+        "Dal Makhani": 13.50,
+        "Mixed Vegetable Curry": 12.50,
+        "Malai Kofta": 16.50
+    },
+    "Main Course - Non-Vegetarian": {
+        "Butter Chicken": 18.90,
+        "Chicken Tikka Masala": 17.90,
+        "Lamb Rogan Josh": 21.90,
+        "Fish Curry": 19.50,
+        "Chicken Biryani": 16.90,
+        "Mutton Biryani": 22.50
+    },
+    "Breads & Rice": {
+        "Garlic Naan": 4.50,
+        "Butter Naan": 3.90,
+        "Tandoori Roti": 3.50,
+        "Plain Rice": 4.50,
+        "Jeera Rice": 5.50,
+        "Kashmiri Pulao": 8.90
+    },
+    "Desserts": {
+        "Gulab Jamun (2 pcs)": 6.50,
+        "Rasmalai": 7.50,
+        "Kheer": 5.90,
+        "Mango Lassi": 5.50,
+        "Masala Chai": 3.50
+    },
+    "Beverages": {
+        "Mango Lassi": 5.50,
+        "Sweet Lassi": 4.50,
+        "Salted Lassi": 4.50,
+        "Masala Chai": 3.50,
+        "Fresh Lime Juice": 4.50,
+        "Mineral Water": 2.50
+    }
+}
+
+
+def load_menu(currency=CURRENCY):
+    """Compile the menu once, from menu.json / menu.csv if available"""
+    if os.path.exists(MENU_JSON):
+        return MenuCatalog.from_json(MENU_JSON, currency)
+    if os.path.exists(MENU_CSV):
+        return MenuCatalog.from_csv(MENU_CSV, currency)
+    return MenuCatalog.from_dict(DEFAULT_MENU, currency)
+
+
+class Order:
+    """One open order: item ID -> {'price', 'quantity'} plus a running subtotal"""
+
+    def __init__(self, order_id, currency):
+        self.order_id = order_id
+        self.items = {}
+        self.subtotal = Money.zero(currency)
+        self.recorded = None  # (invoice number, time) once the order is checked out
+        self.checking_out = False  # True while the sale is being written to the ledger
+        self.checkout_lock = threading.Lock()  # One checkout of this order at a time
+
+    def check_open(self):
+        if self.recorded is not None or self.checking_out:
+            raise ValueError(f"Order {self.order_id} is already checked out; start a new order")
+
+
+class BillingEngine:
+    """Orders, pricing, tax and invoices with no UI attached.
+
+    Several front ends (the Tk app, counter terminals over HTTP, a kitchen
+    display) can share one engine: every order has an ID and all changes go
+    through a lock. Checking out records the sale in the ledger, if one is
+    given, and returns a plain invoice dict that InvoiceRenderer can print.
+    """
+
+    def __init__(self, menu, tax_rate=TAX_RATE, ledger=None):
+        self.menu = menu
+        self.currency = menu.currency
+        self.tax_rate = tax_rate
+        self.tax_label = f"GST ({tax_rate * 100:g}%)"
+        self.ledger = ledger
+        self._orders = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def open_order(self):
+        """Start an empty order and return its ID"""
+        with self._lock:
+            order_id = next(self._ids)
+            self._orders[order_id] = Order(order_id, self.currency)
+            return order_id
+
+    def order(self, order_id):
+        """The Order for an ID (KeyError if it is unknown or closed)"""
+        order = self._orders.get(order_id)
+        if order is None:
+            raise KeyError(f"Unknown order: {order_id}")
+        return order
+
+    def open_orders(self):
+        return list(self._orders)
+
+    def close_order(self, order_id):
+        with self._lock:
+            if self._orders.pop(order_id, None) is None:
+                raise KeyError(f"Unknown order: {order_id}")
+
+    def add_item(self, order_id, item_id, quantity=1):
+        """Add quantity of a menu item; returns the item's line in the order"""
+        if item_id not in self.menu:
+            raise KeyError(f"Unknown menu item: {item_id}")
+        if not isinstance(quantity, int) or quantity <= 0:
+            raise ValueError("Quantity must be at least 1")
+        with self._lock:
+            order = self.order(order_id)
+            order.check_open()
+            line = order.items.get(item_id)
+            if line is None:
+                line = order.items[item_id] = {'price': self.menu.price(item_id), 'quantity': 0}
+            line['quantity'] += quantity
+            order.subtotal += line['price'] * quantity
+            return line
+
+    def remove_item(self, order_id, item_id):
+        """Drop an item from the order; returns False if it was not there"""
+        with self._lock:
+            order = self.order(order_id)
+            order.check_open()
+            line = order.items.pop(item_id, None)
+            if line is None:
+                return False
+            order.subtotal -= line['price'] * line['quantity']
+            return True
+
+    def clear_order(self, order_id):
+        with self._lock:
+            order = self.order(order_id)
+            order.check_open()
+            order.items = {}
+            order.subtotal = Money.zero(self.currency)
+
+    def totals(self, order_id):
+        """(subtotal, tax, total) for an order"""
+        subtotal = self.order(order_id).subtotal
+        tax = subtotal.apply_rate(self.tax_rate)
+        return subtotal, tax, subtotal + tax
+
+    def checkout(self, order_id, created_at=None):
+        """Record the sale (once per order) and return its invoice.
+
+        Checking out the same order again returns the same invoice number,
+        so reprints do not count as new sales. A checked-out order cannot be
+        changed; further items go on a new order.
+
+        The ledger write happens outside the engine lock, so other orders
+        (and other terminals) are not held up by the SQLite commit.
+        """
+        order = self.order(order_id)
+        with order.checkout_lock:
+            with self._lock:
+                self.order(order_id)  # KeyError if it was closed meanwhile
+                if not order.items:
+                    raise ValueError("No items in the order")
+                subtotal = order.subtotal
+                tax = subtotal.apply_rate(self.tax_rate)
+                lines = [(item_id, self.menu.name(item_id), line['quantity'], line['price'])
+                         for item_id, line in order.items.items()]
+                recorded = order.recorded
+                order.checking_out = recorded is None  # Freeze the order during the write
+            if recorded is None:
+                created_at = created_at or datetime.now()
+                invoice_no = None
+                try:
+                    if self.ledger is not None:
+                        invoice_no = self.ledger.record_order(
+                            [(item_id, name, self.menu.category(item_id), quantity, price)
+                             for item_id, name, quantity, price in lines],
+                            tax, created_at)
+                    recorded = (invoice_no, created_at)
+                finally:
+                    with self._lock:
+                        order.recorded = recorded
+                        order.checking_out = False
+            invoice_no, created_at = recorded
+        return {
+            'invoice_no': invoice_no,
+            'number': invoice_label(invoice_no) if invoice_no is not None else f"DRAFT-{order_id}",
+            'date': created_at.strftime('%d-%m-%Y %H:%M:%S'),
+            'currency': self.currency,
+            'lines': [(name, quantity, price) for _, name, quantity, price in lines],
+            'subtotal': subtotal,
+            'tax_label': self.tax_label,
+            'tax': tax,
+            'total': subtotal + tax,
+        }
+
+
+def benchmark(orders=20_000, threads=4):
+    """Orders per second through the engine, in memory and with a scratch ledger"""
+    import random
+    import tempfile
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from sales_ledger import SalesLedger
+
+    menu = load_menu()
+    random.seed(0)
+    baskets = [[(random.choice(menu.ids), random.randint(1, 3)) for _ in range(random.randint(1, 6))]
+               for _ in range(orders)]
+
+    def run(engine, basket):
+        order_id = engine.open_order()
+        for item_id, quantity in basket:
+            engine.add_item(order_id, item_id, quantity)
+        engine.checkout(order_id)
+        engine.close_order(order_id)
+
+    for name, ledger in [("in memory", None),
+                         ("with ledger", SalesLedger(os.path.join(tempfile.mkdtemp(), "bench.db")))]:
+        engine = BillingEngine(menu, ledger=ledger)
+        count = orders if ledger is None else orders // 10
+        began = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda basket: run(engine, basket), baskets[:count]))
+        elapsed = time.perf_counter() - began
+        print(f"{name:>12}: {count / elapsed:10,.0f} orders/s ({count} orders, {threads} threads)")
+
+
+if __name__ == "__main__":
+    benchmark()
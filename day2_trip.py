@@ -1,4 +1,5 @@
 import streamlit as st
+from money import Money
 
 # -------------------------------
 # Title and Description
@@ -44,17 +45,19 @@ if st.button("Calculate Settlement") and expenses:
     if "" in expenses.keys():
         st.error("😅 Oops! Looks like someone forgot to write their name. Please fill in all name fields.")
     else:
-        # 2️⃣ Check if total of amounts matches total_amount
-        sum_entered = sum(expenses.values())
-        if sum_entered != total_amount:
+        # 2️⃣ Check if total of amounts matches total_amount (exactly, in paise)
+        total = Money.from_major(total_amount, "INR")
+        spent_by = {name: Money.from_major(spent, "INR") for name, spent in expenses.items()}
+        sum_entered = sum(spent_by.values(), Money.zero("INR"))
+        if sum_entered != total:
             st.error(f"🤔 Hmm, the numbers are having a little disagreement. "
                      f"The total of the amounts (₹{sum_entered:.2f}) doesn't equal the total you entered (₹{total_amount:.2f}). Please check again!")
         else:
-            # Proceed with calculation
-            equal_share = total_amount / num_people
+            # Proceed with calculation; shares differ by at most one paisa and add up exactly
+            shares = total.allocate(int(num_people))
             st.subheader("📊 Settlement Summary")
 
-            for name, spent in expenses.items():
+            for (name, spent), equal_share in zip(spent_by.items(), shares):
                 balance = spent - equal_share
                 if balance > 0:
                     st.success(f"{name} should **get back ₹{balance:.2f}**")
@@ -2,8 +2,7 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta, date
 import time
-import json
-import os
+from hydration_store import open_store, DEFAULT_GOAL
 
 # Page configuration
 st.set_page_config(
@@ -76,34 +75,20 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Data storage functions
-def load_data():
-    """Load historical data from JSON file"""
-    if os.path.exists("water_intake_data.json"):
-        with open("water_intake_data.json", "r") as f:
-            return json.load(f)
-    return {}
+@st.cache_resource
+def get_store():
+    """Shared storage engine (JSON log or SQLite, see HYDRATION_BACKEND)"""
+    return open_store()
 
-def save_data(data):
-    """Save historical data to JSON file"""
-    with open("water_intake_data.json", "w") as f:
-        json.dump(data, f)
+store = get_store()
 
 def get_daily_goal(target_date):
     """Get the daily goal for a specific date"""
-    data = load_data()
-    date_str = target_date.isoformat()
-    if date_str in data and "daily_goal" in data[date_str]:
-        return data[date_str]["daily_goal"]
-    return 3000  # Default goal
+    return store.get_goal(target_date)
 
 def update_daily_goal(target_date, goal):
     """Update the daily goal for a specific date"""
-    data = load_data()
-    date_str = target_date.isoformat()
-    if date_str not in data:
-        data[date_str] = {"intake": 0, "history": []}
-    data[date_str]["daily_goal"] = goal
-    save_data(data)
+    store.set_goal(target_date, goal)
 
 # Initialize session state variables
 if 'water_intake' not in st.session_state:
@@ -126,30 +111,18 @@ if 'hist_time' not in st.session_state:
 # Check if it's a new day and reset if needed
 current_date = datetime.now().date()
 if current_date != st.session_state.last_reset:
-    # Save yesterday's data
-    data = load_data()
-    yesterday_str = st.session_state.last_reset.isoformat()
-    if st.session_state.water_intake > 0:
-        data[yesterday_str] = {
-            "intake": st.session_state.water_intake,
-            "history": st.session_state.intake_history,
-            "daily_goal": get_daily_goal(st.session_state.last_reset)
-        }
-        save_data(data)
-    
-    # Reset daily values
+    # Yesterday's intakes are already in the log, so just reset daily values
     st.session_state.water_intake = 0
     st.session_state.intake_history = []
     st.session_state.goal_reached = False
     st.session_state.last_reset = current_date
 
 # Load data for the current view date
-view_date_str = st.session_state.view_date.isoformat()
-data = load_data()
-if view_date_str in data:
-    st.session_state.water_intake = data[view_date_str]["intake"]
-    st.session_state.intake_history = data[view_date_str]["history"]
-    st.session_state.custom_goal = data[view_date_str].get("daily_goal", 3000)
+view_record = store.get_day(st.session_state.view_date)
+if view_record is not None:
+    st.session_state.water_intake = view_record["intake"]
+    st.session_state.intake_history = view_record["history"]
+    st.session_state.custom_goal = view_record.get("daily_goal", 3000)
 else:
     st.session_state.water_intake = 0
     st.session_state.intake_history = []
@@ -223,32 +196,17 @@ with st.sidebar:
         else:
             amount = intake_options[selected_intake]
         
-        # Update current data
-        st.session_state.water_intake += amount
-        
         # Use current time for today's entries, stored time for historical entries
         if st.session_state.view_date == datetime.now().date():
             timestamp = datetime.now().strftime("%H:%M:%S")
         else:
             timestamp = st.session_state.hist_time.strftime("%H:%M:%S")
-            
-        intake_record = {
-            "timestamp": timestamp,
-            "amount": amount,
-            "daily_total": st.session_state.water_intake
-        }
-        st.session_state.intake_history.append(intake_record)
         
-        # Save to storage
-        data = load_data()
-        date_str = st.session_state.view_date.isoformat()
-        if date_str not in data:
-            data[date_str] = {"intake": 0, "history": []}
-        
-        data[date_str]["intake"] = st.session_state.water_intake
-        data[date_str]["history"] = st.session_state.intake_history
-        data[date_str]["daily_goal"] = st.session_state.custom_goal
-        save_data(data)
+        # Append to the intake log and refresh current data from it
+        record = store.add_intake(st.session_state.view_date, timestamp, amount,
+                                  daily_goal=st.session_state.custom_goal)
+        st.session_state.water_intake = record["intake"]
+        st.session_state.intake_history = record["history"]
         
         # Check if goal is reached
         if st.session_state.water_intake >= daily_goal and not st.session_state.goal_reached:
@@ -264,15 +222,7 @@ with st.sidebar:
     
     # Generate weekly data for chart
     dates = [datetime.now().date() - timedelta(days=i) for i in range(6, -1, -1)]
-    water_intakes = []
-    
-    for d in dates:
-        date_str = d.isoformat()
-        data = load_data()
-        if date_str in data:
-            water_intakes.append(data[date_str]["intake"])
-        else:
-            water_intakes.append(0)
+    water_intakes = store.intakes_between(dates[0], dates[-1])
     
     weekly_data = {
         "Date": dates,
@@ -287,7 +237,7 @@ with st.sidebar:
         st.caption("Weekly Water Intake (ml)")
         
         # Add goal line
-        avg_goal = sum([get_daily_goal(d) for d in dates]) / len(dates)
+        avg_goal = sum(store.goals_between(dates[0], dates[-1])) / len(dates)
         st.write(f"Average Daily Goal: {avg_goal:.0f}ml")
     else:
         st.info("No data available for weekly chart yet.")
@@ -345,27 +295,13 @@ if st.session_state.edit_mode and st.session_state.view_date != datetime.now().d
     
     if st.button("Add Historical Record"):
         if hist_amount > 0:
-            # Update current data
-            st.session_state.water_intake += hist_amount
-            
             # Use the selected time for historical entries
-            intake_record = {
-                "timestamp": st.session_state.hist_time.strftime("%H:%M:%S"),
-                "amount": hist_amount,
-                "daily_total": st.session_state.water_intake
-            }
-            st.session_state.intake_history.append(intake_record)
-            
-            # Save to storage
-            data = load_data()
-            date_str = st.session_state.view_date.isoformat()
-            if date_str not in data:
-                data[date_str] = {"intake": 0, "history": []}
-            
-            data[date_str]["intake"] = st.session_state.water_intake
-            data[date_str]["history"] = st.session_state.intake_history
-            data[date_str]["daily_goal"] = st.session_state.custom_goal
-            save_data(data)
+            record = store.add_intake(st.session_state.view_date,
+                                      st.session_state.hist_time.strftime("%H:%M:%S"),
+                                      hist_amount,
+                                      daily_goal=st.session_state.custom_goal)
+            st.session_state.water_intake = record["intake"]
+            st.session_state.intake_history = record["history"]
             
             st.success(f"Added {hist_amount}ml for {st.session_state.view_date.strftime('%B %d, %Y')} at {st.session_state.hist_time.strftime('%H:%M')}")
             time.sleep(0.5)
@@ -380,39 +316,35 @@ with st.expander("Monthly Summary"):
     next_month = first_day.replace(day=28) + timedelta(days=4)  # Ensure we get to the next month
     last_day = next_month - timedelta(days=next_month.day)
     
-    month_days = [first_day + timedelta(days=i) for i in range((last_day - first_day).days + 1)]
+    summary = store.summary
     
-    month_data = []
-    for day in month_days:
-        day_str = day.isoformat()
-        data = load_data()
-        if day_str in data:
-            intake = data[day_str]["intake"]
-            goal = data[day_str].get("daily_goal", 3000)
-            achieved = "✅" if intake >= goal else "❌"
-            month_data.append({
-                "Date": day.strftime("%Y-%m-%d"),
-                "Intake (ml)": intake,
-                "Goal (ml)": goal,
-                "Achieved": achieved
-            })
-        else:
+    # Only rebuild the month table when the underlying data has changed
+    cache_key = (first_day, summary.version)
+    if st.session_state.get("month_table_key") != cache_key:
+        month_data = []
+        for day in (first_day + timedelta(days=i) for i in range((last_day - first_day).days + 1)):
+            day_str = day.isoformat()
             month_data.append({
-                "Date": day.strftime("%Y-%m-%d"),
-                "Intake (ml)": 0,
-                "Goal (ml)": get_daily_goal(day),
-                "Achieved": "❌"
+                "Date": day_str,
+                "Intake (ml)": summary.day_totals.get(day_str, 0),
+                "Goal (ml)": summary.day_goals.get(day_str, DEFAULT_GOAL),
+                "Achieved": "✅" if summary.is_achieved(day) else "❌"
             })
+        st.session_state.month_table = pd.DataFrame(month_data)
+        st.session_state.month_table_key = cache_key
     
-    month_df = pd.DataFrame(month_data)
-    st.dataframe(month_df, use_container_width=True)
+    st.dataframe(st.session_state.month_table, use_container_width=True)
     
-    # Calculate success rate
-    achieved_days = len([d for d in month_data if d["Achieved"] == "✅"])
-    total_days = len(month_data)
+    # Success rate and streak come straight from the maintained aggregates
+    achieved_days = summary.achieved_in_month(today.year, today.month)
+    total_days = last_day.day
     success_rate = (achieved_days / total_days) * 100 if total_days > 0 else 0
     
-    st.metric("Monthly Success Rate", f"{success_rate:.1f}%", f"{achieved_days}/{total_days} days")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Monthly Success Rate", f"{success_rate:.1f}%", f"{achieved_days}/{total_days} days")
+    with col2:
+        st.metric("Current Streak", f"{summary.current_streak(today)} days")
 
 # Hydration tips
 st.markdown("---")
@@ -430,11 +362,7 @@ for tip in tips:
 
 # Reset button (for testing purposes)
 if st.button("Reset Current Day Data (for testing)"):
-    data = load_data()
-    date_str = st.session_state.view_date.isoformat()
-    if date_str in data:
-        del data[date_str]
-        save_data(data)
+    store.delete_day(st.session_state.view_date)
     
     st.session_state.water_intake = 0
     st.session_state.intake_history = []
@@ -0,0 +1,189 @@
+import bisect
+
+import pandas as pd
+
+WORKOUT_COLUMNS = ['date', 'exercise', 'sets', 'reps', 'weight']
+
+
+def typed_workouts(workouts):
+    """Return the workouts frame with proper dtypes (datetime64 dates, int64 numbers)"""
+    typed = workouts[WORKOUT_COLUMNS].copy()
+    typed['date'] = pd.to_datetime(typed['date']).dt.normalize()
+    typed['exercise'] = typed['exercise'].astype('category')
+    for col in ['sets', 'reps', 'weight']:
+        typed[col] = pd.to_numeric(typed[col]).astype('int64')
+    return typed
+
+
+def format_dates(dates):
+    """Vectorized YYYY-MM-DD labels for a datetime Series"""
+    return dates.dt.strftime('%Y-%m-%d')
+
+
+def weekly_progress(workouts, start_date, end_date):
+    """Weekly aggregates for workouts between start_date and end_date (inclusive).
+
+    Returns (window, weekly_summary, weekly_totals):
+    - window: the typed rows in range with 'week' (Monday) and 'volume' columns
+    - weekly_summary: per week and exercise volume, max weight and set count
+    - weekly_totals: per week volume and set count with a 'week_label'
+    """
+    typed = typed_workouts(workouts)
+    mask = typed['date'].between(pd.Timestamp(start_date), pd.Timestamp(end_date))
+    window = typed[mask]
+
+    # Weekly periods run Monday-Sunday, so start_time is the Monday of each week
+    window = window.assign(
+        week=window['date'].dt.to_period('W').dt.start_time,
+        volume=window['sets'] * window['reps'] * window['weight'],
+    )
+
+    weekly_summary = window.groupby(['week', 'exercise'], observed=True).agg(
+        volume=('volume', 'sum'),
+        weight=('weight', 'max'),
+        sets=('sets', 'count'),
+    ).reset_index()
+    weekly_summary['exercise'] = weekly_summary['exercise'].astype(str)
+    weekly_summary['week_label'] = format_dates(weekly_summary['week'])
+
+    # Totals are rolled up from the per-exercise summary instead of the raw rows
+    weekly_totals = weekly_summary.groupby(['week', 'week_label']).agg(
+        volume=('volume', 'sum'),
+        sets=('sets', 'sum'),
+    ).reset_index()
+
+    return window, weekly_summary, weekly_totals
+
+
+def epley_1rm(weight, reps):
+    """Estimated one-rep max (Epley): weight * (1 + reps / 30)"""
+    return weight if reps <= 1 else weight * (1 + reps / 30)
+
+
+def brzycki_1rm(weight, reps):
+    """Estimated one-rep max (Brzycki): weight * 36 / (37 - reps)"""
+    return weight if reps <= 1 else weight * 36 / (37 - min(reps, 36))
+
+
+class ExerciseRecords:
+    """Personal records and weekly bests for one exercise"""
+
+    def __init__(self):
+        self.max_weight = None      # (weight, date)
+        self.max_volume_set = None  # (sets * reps * weight, date)
+        self.best_1rm = None        # (Epley estimate, Brzycki estimate, date)
+        self.history = []           # (date, record name, value) each time a record was set
+        self._weeks = []            # sorted week starts, for range lookups
+        self._weekly_max_weight = {}
+        self._weekly_best_1rm = {}
+
+    def add(self, date, sets, reps, weight):
+        """Fold in one logged set and return the names of any records it broke"""
+        broken = []
+        volume = sets * reps * weight
+        epley, brzycki = epley_1rm(weight, reps), brzycki_1rm(weight, reps)
+
+        if self.max_weight is None or weight > self.max_weight[0]:
+            self.max_weight = (weight, date)
+            broken.append('Max Weight')
+        if self.max_volume_set is None or volume > self.max_volume_set[0]:
+            self.max_volume_set = (volume, date)
+            broken.append('Max Volume Set')
+        if self.best_1rm is None or epley > self.best_1rm[0]:
+            self.best_1rm = (epley, brzycki, date)
+            broken.append('Estimated 1RM')
+        for name in broken:
+            value = {'Max Weight': weight, 'Max Volume Set': volume, 'Estimated 1RM': epley}[name]
+            self.history.append((date, name, value))
+
+        week = date - pd.Timedelta(days=date.weekday())
+        if week not in self._weekly_max_weight:
+            bisect.insort(self._weeks, week)
+            self._weekly_max_weight[week] = weight
+            self._weekly_best_1rm[week] = epley
+        else:
+            self._weekly_max_weight[week] = max(self._weekly_max_weight[week], weight)
+            self._weekly_best_1rm[week] = max(self._weekly_best_1rm[week], epley)
+
+        # The very first set of an exercise sets a baseline rather than a record
+        return broken if len(self.history) > len(broken) else []
+
+    def weekly_bests(self, start_date, end_date):
+        """DataFrame of per-week max weight and best 1RM for weeks in the range"""
+        lo = bisect.bisect_left(self._weeks, pd.Timestamp(start_date) - pd.Timedelta(days=6))
+        hi = bisect.bisect_right(self._weeks, pd.Timestamp(end_date))
+        weeks = self._weeks[lo:hi]
+        return pd.DataFrame({
+            'week_label': [week.strftime('%Y-%m-%d') for week in weeks],
+            'weight': [self._weekly_max_weight[week] for week in weeks],
+            'estimated_1rm': [round(self._weekly_best_1rm[week], 1) for week in weeks],
+        })
+
+
+class PRIndex:
+    """Personal-record index per exercise, updated as each set is logged.
+
+    Each update is a dict lookup plus a bisect into the exercise's sorted
+    weeks, so the dashboard and new-record detection never re-aggregate
+    the whole history.
+    """
+
+    def __init__(self):
+        self._exercises = {}
+
+    def add(self, date, exercise, sets, reps, weight):
+        """Index one logged set; returns the records it broke (empty list if none)"""
+        records = self._exercises.setdefault(exercise, ExerciseRecords())
+        return records.add(pd.Timestamp(date).normalize(), int(sets), int(reps), int(weight))
+
+    def get(self, exercise):
+        """The ExerciseRecords for an exercise, or None if it was never logged"""
+        return self._exercises.get(exercise)
+
+
+def _legacy_weekly_progress(workouts, start_date, end_date):
+    """Row-by-row version the dashboard used before, kept for the benchmark"""
+    from datetime import timedelta
+
+    data = workouts[(workouts['date'] >= pd.Timestamp(start_date)) &
+                    (workouts['date'] <= pd.Timestamp(end_date))].copy()
+    data['week'] = data['date'].apply(lambda x: x - timedelta(days=x.weekday()))
+    data['volume'] = data['sets'] * data['reps'] * data['weight']
+    summary = data.groupby(['week', 'exercise']).agg({
+        'volume': 'sum', 'weight': 'max', 'sets': 'count'
+    }).reset_index()
+    totals = data.groupby('week').agg({'volume': 'sum', 'sets': 'count'}).reset_index()
+    totals['week_label'] = totals['week'].apply(lambda x: x.strftime('%Y-%m-%d'))
+    summary['week_label'] = summary['week'].apply(lambda x: x.strftime('%Y-%m-%d'))
+    return data, summary, totals
+
+
+def benchmark(rows=100_000):
+    """Compare the vectorized pipeline with the old per-row lambdas"""
+    import time
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    exercises = ['Bench Press', 'Squat', 'Deadlift', 'Shoulder Press',
+                 'Pull-ups', 'Bicep Curls', 'Tricep Extensions', 'Leg Press']
+    end = pd.Timestamp.today().normalize()
+    workouts = pd.DataFrame({
+        'date': end - pd.to_timedelta(rng.integers(0, 365, rows), unit='D'),
+        'exercise': rng.choice(exercises, rows),
+        'sets': rng.integers(1, 6, rows),
+        'reps': rng.integers(1, 15, rows),
+        'weight': rng.integers(10, 300, rows),
+    })
+    start = end - pd.Timedelta(days=365)
+
+    for name, func in [("legacy (apply)", _legacy_weekly_progress),
+                       ("vectorized", weekly_progress)]:
+        began = time.perf_counter()
+        _, summary, totals = func(workouts, start, end)
+        elapsed = time.perf_counter() - began
+        print(f"{name:>15}: {elapsed * 1000:8.1f} ms  "
+              f"({len(totals)} weeks, {len(summary)} week/exercise rows)")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,581 @@
+import itertools
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from file_lock import locked
+
+DATA_FILE = "water_intake_data.json"
+LOG_FILE = "water_intake_log.jsonl"
+DB_FILE = "water_intake.db"
+DEFAULT_GOAL = 3000
+STORAGE_BACKEND = os.environ.get("HYDRATION_BACKEND", "json")  # "json" or "sqlite"
+
+_summary_versions = itertools.count(1)
+COMPACT_EVERY = 200  # Fold the log into the snapshot after this many events
+SNAPSHOT_GENERATION_KEY = "_log_generation"  # Snapshot key: last compacted log folded into it
+
+
+class HydrationSummary:
+    """Incrementally maintained per-day totals, monthly achieved-day counts
+    and the running streak, so the dashboard never rescans the history.
+    """
+
+    def __init__(self):
+        self.day_totals = {}
+        self.day_goals = {}
+        self.month_achieved = {}
+        self._achieved = set()
+        self._streak_cache = None
+        self.version = next(_summary_versions)  # Changes whenever any day changes
+
+    def update_day(self, date_str, total, goal):
+        """Record the latest total and goal for a day (total=None removes it)"""
+        if total is None:
+            self.day_totals.pop(date_str, None)
+            self.day_goals.pop(date_str, None)
+        else:
+            self.day_totals[date_str] = total
+            self.day_goals[date_str] = goal
+        self.version = next(_summary_versions)
+
+        achieved = total is not None and total >= goal
+        if achieved == (date_str in self._achieved):
+            return
+        month = date_str[:7]
+        if achieved:
+            self._achieved.add(date_str)
+            self.month_achieved[month] = self.month_achieved.get(month, 0) + 1
+        else:
+            self._achieved.discard(date_str)
+            self.month_achieved[month] -= 1
+        self._streak_cache = None
+
+    def is_achieved(self, target_date):
+        return target_date.isoformat() in self._achieved
+
+    def achieved_in_month(self, year, month):
+        return self.month_achieved.get(f"{year:04d}-{month:02d}", 0)
+
+    def current_streak(self, today):
+        """Consecutive achieved days ending today (or yesterday, if today is still open)"""
+        if self._streak_cache and self._streak_cache[0] == today:
+            return self._streak_cache[1]
+        day = today if today.isoformat() in self._achieved else today - timedelta(days=1)
+        streak = 0
+        while day.isoformat() in self._achieved:
+            streak += 1
+            day -= timedelta(days=1)
+        self._streak_cache = (today, streak)
+        return streak
+
+
+class HydrationStore:
+    """Date-indexed, in-memory view of the hydration history.
+
+    History lives in two files: a JSON snapshot (same format as before) and
+    an append-only JSONL event log. Every change is a single fsync'd append
+    to the log; the snapshot is only rewritten when the log is compacted.
+    The parsed state is kept in memory and only the new tail of the log is
+    replayed when another session appended to it. One instance can be
+    shared by many sessions: loading, appending and compacting take a lock.
+
+    Appends and compaction from different processes are serialized by an
+    advisory lock on <log>.lock. Compaction renames the log to
+    <log>.<generation>.compacting and stamps the new snapshot with that
+    generation, so a rotated log left behind by a crash is replayed only if
+    the snapshot does not already contain it.
+    """
+
+    def __init__(self, path=DATA_FILE, log_path=LOG_FILE, compact_every=COMPACT_EVERY):
+        self.path = path
+        self.log_path = log_path
+        self.lock_path = log_path + ".lock"
+        self.compact_every = compact_every
+        self._data = {}
+        self._summary = HydrationSummary()
+        self._snapshot_signature = ()  # Never a real signature: the first load rebuilds
+        self._log_ino = None
+        self._log_offset = 0
+        self._log_events = 0
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _signature(path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    @staticmethod
+    def _stat(path):
+        try:
+            return os.stat(path)
+        except FileNotFoundError:
+            return None
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock against appends and compactions in other processes"""
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            with locked(fd):
+                yield
+        finally:
+            os.close(fd)
+
+    def _rotated_log_path(self, generation):
+        return f"{self.log_path}.{generation}.compacting"
+
+    def _read_snapshot(self):
+        """(history dict, generation of the last log folded into it)"""
+        if not os.path.exists(self.path):
+            return {}, 0
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        return data, data.pop(SNAPSHOT_GENERATION_KEY, 0)
+
+    def _replay(self, path, offset=0, ino=None):
+        """Apply complete events from a log file; return (new offset, count).
+
+        With ino given, nothing is applied (and None is returned) if the
+        file at path is no longer that log, e.g. it was rotated meanwhile.
+        """
+        try:
+            with open(path, "rb") as f:
+                if ino is not None and os.fstat(f.fileno()).st_ino != ino:
+                    return None
+                f.seek(offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            return None if ino is not None else (0, 0)
+
+        count = 0
+        end = chunk.rfind(b"\n") + 1  # Ignore a torn, half-written last line
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            self._apply(event)
+            count += 1
+        return offset + end, count
+
+    def load(self):
+        """Return the full history dict, replaying only new log entries"""
+        with self._lock:
+            return self._load()
+
+    def _load(self):
+        log_stat = self._stat(self.log_path)
+        log_ino = log_stat.st_ino if log_stat else None
+        log_size = log_stat.st_size if log_stat else 0
+
+        if (self._signature(self.path) != self._snapshot_signature
+                or (self._log_ino is not None and log_ino != self._log_ino)
+                or log_size < self._log_offset):
+            # Snapshot changed (or the log was compacted): rebuild from scratch
+            self._rebuild()
+        elif log_size > self._log_offset:
+            replayed = self._replay(self.log_path, self._log_offset, log_ino)
+            if replayed is None:
+                self._rebuild()  # Compacted between the stat and the read
+            else:
+                self._log_ino = log_ino
+                self._log_offset, count = replayed
+                self._log_events += count
+        return self._data
+
+    def _rebuild(self):
+        with self._file_lock():
+            snapshot_signature = self._signature(self.path)
+            self._data, generation = self._read_snapshot()
+            self._summary = HydrationSummary()
+            for date_str, record in self._data.items():
+                self._summary.update_day(date_str, record["intake"],
+                                         record.get("daily_goal", DEFAULT_GOAL))
+            # A rotated log the snapshot does not cover yet (compaction crashed midway)
+            self._replay(self._rotated_log_path(generation + 1))
+            log_stat = self._stat(self.log_path)
+            self._log_ino = log_stat.st_ino if log_stat else None
+            self._log_offset, self._log_events = self._replay(self.log_path)
+            self._snapshot_signature = snapshot_signature
+
+    def _apply(self, event):
+        date_str = event["date"]
+        kind = event.get("type", "intake")
+        if kind == "reset":
+            self._data.pop(date_str, None)
+            self._summary.update_day(date_str, None, None)
+            return
+
+        record = self._data.setdefault(date_str, {"intake": 0, "history": []})
+        if kind == "intake":
+            record["intake"] += event["amount"]
+            record["history"].append({
+                "timestamp": event["timestamp"],
+                "amount": event["amount"],
+                "daily_total": record["intake"]
+            })
+            if "daily_goal" in event:
+                record.setdefault("daily_goal", event["daily_goal"])
+        elif kind == "goal":
+            record["daily_goal"] = event["goal"]
+        self._summary.update_day(date_str, record["intake"],
+                                 record.get("daily_goal", DEFAULT_GOAL))
+
+    @property
+    def summary(self):
+        """Up-to-date rolling aggregates for the dashboard"""
+        with self._lock:
+            self._load()
+            return self._summary
+
+    def _append(self, event):
+        """Durably append one event to the log and apply it in memory"""
+        with self._lock:
+            self._load()
+            event["logged_at"] = datetime.now().isoformat(timespec="seconds")
+            line = (json.dumps(event) + "\n").encode("utf-8")
+
+            with self._file_lock():
+                fd = os.open(self.log_path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    size = os.fstat(fd).st_size
+                    if size:
+                        os.lseek(fd, size - 1, os.SEEK_SET)
+                        if os.read(fd, 1) != b"\n":
+                            line = b"\n" + line  # Terminate a torn line left by a crashed writer
+                    os.write(fd, line)
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+
+            # Pick up anything other sessions appended, including our own event
+            self._load()
+            if self._log_events >= self.compact_every:
+                self.compact()
+
+    def compact(self):
+        """Fold the event log into a fresh snapshot and start a new log"""
+        with self._lock:
+            log_ino = self._log_ino
+            with self._file_lock():
+                log_stat = self._stat(self.log_path)
+                if log_ino is None or (log_stat is not None and log_stat.st_ino == log_ino):
+                    # Not already compacted by another process since we counted its events
+                    self._compact()
+            self._snapshot_signature = ()
+            self._load()
+
+    def _compact(self):
+        """Rotate and fold the log into the snapshot (hold the file lock)"""
+        self._data, generation = self._read_snapshot()
+        folded_path = self._rotated_log_path(generation)
+        if os.path.exists(folded_path):
+            os.remove(folded_path)  # Already in the snapshot; left by a crash before its removal
+        rotated_path = self._rotated_log_path(generation + 1)
+        if not os.path.exists(rotated_path):
+            # New appends go to a fresh log from here on
+            try:
+                os.replace(self.log_path, rotated_path)
+            except FileNotFoundError:
+                return
+        # else: finish the compaction a crashed process started; the log waits for the next one
+        self._replay(rotated_path)
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(dict(self._data, **{SNAPSHOT_GENERATION_KEY: generation + 1}), f)
+            f.flush()
+            os.fsync(f.fileno())
+        # The snapshot now covers rotated_path; replaying it again is skipped by generation
+        os.replace(tmp_path, self.path)
+        os.remove(rotated_path)
+
+    # Date-indexed lookups
+    def get_day(self, target_date):
+        """Return a copy of the stored record for a date, or None"""
+        with self._lock:
+            record = self._load().get(target_date.isoformat())
+            if record is None:
+                return None
+            return dict(record, history=list(record.get("history", [])))
+
+    def get_intake(self, target_date):
+        record = self.get_day(target_date)
+        return record["intake"] if record else 0
+
+    def get_goal(self, target_date):
+        record = self.get_day(target_date)
+        if record and "daily_goal" in record:
+            return record["daily_goal"]
+        return DEFAULT_GOAL
+
+    # Range queries
+    def days_between(self, start_date, end_date):
+        """Return (date, record) pairs for every day in the inclusive range"""
+        with self._lock:
+            data = self._load()
+            days = []
+            day = start_date
+            while day <= end_date:
+                days.append((day, data.get(day.isoformat())))
+                day += timedelta(days=1)
+        return days
+
+    def intakes_between(self, start_date, end_date):
+        return [record["intake"] if record else 0
+                for _, record in self.days_between(start_date, end_date)]
+
+    def goals_between(self, start_date, end_date):
+        return [record.get("daily_goal", DEFAULT_GOAL) if record else DEFAULT_GOAL
+                for _, record in self.days_between(start_date, end_date)]
+
+    def achieved_days(self, start_date, end_date):
+        """Number of days in the range where intake reached the goal"""
+        return sum(1 for _, record in self.days_between(start_date, end_date)
+                   if record and record["intake"] >= record.get("daily_goal", DEFAULT_GOAL))
+
+    # Updates (each one is a single appended event)
+    def add_intake(self, target_date, timestamp, amount, daily_goal=None):
+        """Record one intake and return the updated day record"""
+        event = {"type": "intake", "date": target_date.isoformat(),
+                 "timestamp": timestamp, "amount": amount}
+        if daily_goal is not None:
+            event["daily_goal"] = daily_goal
+        self._append(event)
+        return self.get_day(target_date)
+
+    def set_goal(self, target_date, goal):
+        self._append({"type": "goal", "date": target_date.isoformat(), "goal": goal})
+
+    def delete_day(self, target_date):
+        self._append({"type": "reset", "date": target_date.isoformat()})
+
+
+class SQLiteHydrationStore:
+    """SQLite storage engine with the same interface as HydrationStore.
+
+    Intakes are rows in `intake_events` and goals rows in `daily_goals`, both
+    indexed by date, so range and success-rate queries run as aggregate SQL.
+    """
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS intake_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    date TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    amount INTEGER NOT NULL,
+                    logged_at TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_intake_events_date ON intake_events (date);
+                CREATE TABLE IF NOT EXISTS daily_goals (
+                    date TEXT PRIMARY KEY,
+                    goal INTEGER NOT NULL
+                );
+            """)
+        self._summary = None
+        self._data_version = None
+        self._summary_lock = threading.RLock()  # One instance is shared by every session
+
+    @property
+    def summary(self):
+        """Rolling aggregates, rebuilt only when another connection wrote"""
+        with self._summary_lock:
+            data_version = self._query("PRAGMA data_version")[0][0]
+            if self._summary is None or data_version != self._data_version:
+                summary = HydrationSummary()
+                totals = dict(self._query("SELECT date, SUM(amount) FROM intake_events GROUP BY date"))
+                goals = dict(self._query("SELECT date, goal FROM daily_goals"))
+                for date_str in totals.keys() | goals.keys():
+                    summary.update_day(date_str, totals.get(date_str, 0),
+                                       goals.get(date_str, DEFAULT_GOAL))
+                self._summary = summary
+                self._data_version = data_version
+            return self._summary
+
+    def _update_summary(self, target_date):
+        with self._summary_lock:
+            if self._summary is not None:
+                record = self.get_day(target_date)
+                if record is None:
+                    self._summary.update_day(target_date.isoformat(), None, None)
+                else:
+                    self._summary.update_day(target_date.isoformat(), record["intake"],
+                                             record.get("daily_goal", DEFAULT_GOAL))
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _execute(self, statements):
+        with self._lock, self._conn:
+            for sql, params in statements:
+                self._conn.execute(sql, params)
+
+    # Date-indexed lookups
+    def get_day(self, target_date):
+        """Return the record for a date in the JSON store's format, or None"""
+        date_str = target_date.isoformat()
+        events = self._query(
+            "SELECT timestamp, amount FROM intake_events WHERE date = ? ORDER BY id",
+            (date_str,))
+        goal = self._query("SELECT goal FROM daily_goals WHERE date = ?", (date_str,))
+        if not events and not goal:
+            return None
+
+        record = {"intake": 0, "history": []}
+        for timestamp, amount in events:
+            record["intake"] += amount
+            record["history"].append({
+                "timestamp": timestamp,
+                "amount": amount,
+                "daily_total": record["intake"]
+            })
+        if goal:
+            record["daily_goal"] = goal[0][0]
+        return record
+
+    def get_intake(self, target_date):
+        rows = self._query("SELECT COALESCE(SUM(amount), 0) FROM intake_events WHERE date = ?",
+                           (target_date.isoformat(),))
+        return rows[0][0]
+
+    def get_goal(self, target_date):
+        rows = self._query("SELECT goal FROM daily_goals WHERE date = ?",
+                           (target_date.isoformat(),))
+        return rows[0][0] if rows else DEFAULT_GOAL
+
+    # Range queries
+    def _dates(self, start_date, end_date):
+        return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+    def days_between(self, start_date, end_date):
+        """Return (date, record) pairs for every day in the inclusive range"""
+        totals = dict(self._query(
+            "SELECT date, SUM(amount) FROM intake_events WHERE date BETWEEN ? AND ? GROUP BY date",
+            (start_date.isoformat(), end_date.isoformat())))
+        goals = dict(self._query(
+            "SELECT date, goal FROM daily_goals WHERE date BETWEEN ? AND ?",
+            (start_date.isoformat(), end_date.isoformat())))
+
+        days = []
+        for day in self._dates(start_date, end_date):
+            date_str = day.isoformat()
+            if date_str in totals or date_str in goals:
+                record = {"intake": totals.get(date_str, 0)}
+                if date_str in goals:
+                    record["daily_goal"] = goals[date_str]
+                days.append((day, record))
+            else:
+                days.append((day, None))
+        return days
+
+    def intakes_between(self, start_date, end_date):
+        return [record["intake"] if record else 0
+                for _, record in self.days_between(start_date, end_date)]
+
+    def goals_between(self, start_date, end_date):
+        goals = dict(self._query(
+            "SELECT date, goal FROM daily_goals WHERE date BETWEEN ? AND ?",
+            (start_date.isoformat(), end_date.isoformat())))
+        return [goals.get(day.isoformat(), DEFAULT_GOAL) for day in self._dates(start_date, end_date)]
+
+    def achieved_days(self, start_date, end_date):
+        """Number of days in the range where intake reached the goal"""
+        rows = self._query("""
+            SELECT COUNT(*) FROM (
+                SELECT e.date, SUM(e.amount) AS total, COALESCE(g.goal, ?) AS goal
+                FROM intake_events e LEFT JOIN daily_goals g ON g.date = e.date
+                WHERE e.date BETWEEN ? AND ?
+                GROUP BY e.date
+            ) WHERE total >= goal
+        """, (DEFAULT_GOAL, start_date.isoformat(), end_date.isoformat()))
+        return rows[0][0]
+
+    # Updates
+    def add_intake(self, target_date, timestamp, amount, daily_goal=None):
+        """Record one intake and return the updated day record"""
+        date_str = target_date.isoformat()
+        statements = [(
+            "INSERT INTO intake_events (date, timestamp, amount, logged_at) VALUES (?, ?, ?, ?)",
+            (date_str, timestamp, amount, datetime.now().isoformat(timespec="seconds"))
+        )]
+        if daily_goal is not None:
+            statements.append((
+                "INSERT OR IGNORE INTO daily_goals (date, goal) VALUES (?, ?)",
+                (date_str, daily_goal)
+            ))
+        self._execute(statements)
+        self._update_summary(target_date)
+        return self.get_day(target_date)
+
+    def set_goal(self, target_date, goal):
+        self._execute([(
+            "INSERT INTO daily_goals (date, goal) VALUES (?, ?) "
+            "ON CONFLICT(date) DO UPDATE SET goal = excluded.goal",
+            (target_date.isoformat(), goal)
+        )])
+        self._update_summary(target_date)
+
+    def delete_day(self, target_date):
+        date_str = target_date.isoformat()
+        self._execute([
+            ("DELETE FROM intake_events WHERE date = ?", (date_str,)),
+            ("DELETE FROM daily_goals WHERE date = ?", (date_str,)),
+        ])
+        self._update_summary(target_date)
+
+
+def open_store(backend=STORAGE_BACKEND):
+    """Create the storage engine selected by HYDRATION_BACKEND"""
+    if backend == "sqlite":
+        return SQLiteHydrationStore()
+    return HydrationStore()
+
+
+def migrate_json_to_sqlite(json_path=DATA_FILE, log_path=LOG_FILE, db_path=DB_FILE):
+    """One-shot copy of the JSON history (snapshot plus log) into SQLite.
+
+    Returns the number of days migrated, or 0 if the database already has data.
+    """
+    data = HydrationStore(json_path, log_path).load()
+    db = SQLiteHydrationStore(db_path)
+    if db._query("SELECT 1 FROM intake_events LIMIT 1") or db._query("SELECT 1 FROM daily_goals LIMIT 1"):
+        return 0
+
+    statements = []
+    for date_str, record in sorted(data.items()):
+        history = record.get("history", [])
+        if not history and record.get("intake", 0) > 0:
+            history = [{"timestamp": "00:00:00", "amount": record["intake"]}]
+        for entry in history:
+            statements.append((
+                "INSERT INTO intake_events (date, timestamp, amount) VALUES (?, ?, ?)",
+                (date_str, entry["timestamp"], entry["amount"])
+            ))
+        if "daily_goal" in record:
+            statements.append((
+                "INSERT INTO daily_goals (date, goal) VALUES (?, ?)",
+                (date_str, record["daily_goal"])
+            ))
+    db._execute(statements)
+    return len(data)
+
+
+if __name__ == "__main__":
+    migrated = migrate_json_to_sqlite()
+    print(f"Migrated {migrated} days into {DB_FILE}")
@@ -0,0 +1,126 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+RESTAURANT_INFO = "123 Little India Road, Singapore 123456<br/>Tel: +65 6123 4567 | Email: info@spicegarden.sg"
+
+
+class InvoiceRenderer:
+    """Builds invoice PDFs from a prebuilt template.
+
+    Paragraph styles, the static header/footer flowables and the table style
+    are created once. An invoice is a plain dict (number, date, lines,
+    subtotal, tax, total, currency, tax_label), so it can be handed to a
+    worker thread or process without touching Tk.
+    """
+
+    def __init__(self, palette):
+        styles = getSampleStyleSheet()
+        primary = colors.HexColor(palette["primary"])
+
+        title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=20,
+                                     spaceAfter=30, alignment=1, textColor=primary)
+        subtitle_style = ParagraphStyle('CustomSubtitle', parent=styles['Heading2'], fontSize=14,
+                                        spaceAfter=20, alignment=1,
+                                        textColor=colors.HexColor(palette["secondary"]))
+        info_style = ParagraphStyle('InfoStyle', parent=styles['Normal'], fontSize=10,
+                                    spaceAfter=20, alignment=1)
+        invoice_title_style = ParagraphStyle('InvoiceTitle', parent=styles['Heading2'], fontSize=16,
+                                             spaceAfter=20, alignment=0, textColor=primary)
+        thanks_style = ParagraphStyle('ThanksStyle', parent=styles['Normal'], fontSize=11,
+                                      spaceAfter=10, alignment=1, textColor=primary)
+        self.details_style = ParagraphStyle('DetailsStyle', parent=styles['Normal'], fontSize=10,
+                                            spaceAfter=30)
+
+        self.header = [
+            Paragraph("SPICE GARDEN", title_style),
+            Paragraph("Authentic Indian Cuisine", subtitle_style),
+            Paragraph(RESTAURANT_INFO, info_style),
+            Paragraph("INVOICE", invoice_title_style),
+        ]
+        self.footer = [
+            Spacer(1, 30),
+            Paragraph("Thank you for dining at Spice Garden!", thanks_style),
+        ]
+        self.table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(palette["tree_header_bg"])),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'CENTER'),
+            ('ALIGN', (2, 0), (-1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -4), colors.white),
+            ('FONTNAME', (0, 1), (-1, -4), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -4), 10),
+            ('BACKGROUND', (0, -3), (-1, -1), colors.HexColor('#f5f5f5')),
+            ('FONTNAME', (0, -3), (-1, -1), 'Helvetica-Bold'),
+            ('LINEABOVE', (0, -3), (-1, -3), 1, colors.black),
+            ('LINEABOVE', (0, -1), (-1, -1), 1, colors.black),
+        ])
+        self._executor = None
+
+    def render(self, invoice, file_path):
+        """Write one invoice PDF (blocking)"""
+        currency = invoice["currency"]
+        table_data = [['Item', 'Qty', 'Price', 'Total']]
+        for name, quantity, price in invoice["lines"]:
+            table_data.append([name, str(quantity), f"{currency} {price:.2f}",
+                               f"{currency} {price * quantity:.2f}"])
+        table_data.append(['', '', 'Subtotal:', f"{currency} {invoice['subtotal']:.2f}"])
+        table_data.append(['', '', f"{invoice['tax_label']}:", f"{currency} {invoice['tax']:.2f}"])
+        table_data.append(['', '', 'Total:', f"{currency} {invoice['total']:.2f}"])
+
+        table = Table(table_data, colWidths=[280, 60, 80, 80])
+        table.setStyle(self.table_style)
+        details = Paragraph(f"Date: {invoice['date']}<br/>Invoice #: {invoice['number']}",
+                            self.details_style)
+
+        doc = SimpleDocTemplate(file_path, pagesize=letter)
+        doc.build(self.header + [details, table] + self.footer)
+        return file_path
+
+    def render_async(self, invoice, file_path):
+        """Render on a background thread; returns a Future for the file path.
+
+        One worker keeps the shared template flowables from being laid out
+        by two builds at once.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="invoice")
+        return self._executor.submit(self.render, invoice, file_path)
+
+
+# Batch mode: each worker process builds its own renderer once
+_worker_renderer = None
+
+
+def _init_worker(palette):
+    global _worker_renderer
+    _worker_renderer = InvoiceRenderer(palette)
+
+
+def _render_in_worker(job):
+    invoice, file_path = job
+    try:
+        _worker_renderer.render(invoice, file_path)
+    except Exception as e:
+        return file_path, str(e)
+    return file_path, None
+
+
+def render_batch(palette, jobs, max_workers=None):
+    """Render many (invoice, file_path) jobs in parallel across CPU cores.
+
+    Returns a list of (file_path, error message or None) in job order.
+    """
+    jobs = list(jobs)
+    workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(palette,)) as pool:
+        return list(pool.map(_render_in_worker, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
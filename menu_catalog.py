@@ -0,0 +1,115 @@
+import bisect
+import csv
+import itertools
+import json
+import re
+
+from money import Money
+
+
+def item_id_for(name):
+    """Stable item ID derived from the display name, e.g. "Mango Lassi" -> "mango-lassi" """
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+class MenuCatalog:
+    """The menu compiled once into parallel arrays indexed by row number.
+
+    Every dish gets one stable item ID, even when it is listed under more
+    than one category. Categories hold row numbers, lookups by ID are a
+    dict hit, and a sorted word index answers name/prefix searches with
+    bisect instead of scanning the menu.
+    """
+
+    def __init__(self, currency="SGD"):
+        self.currency = currency
+        self.ids = []
+        self.names = []
+        self.prices = []
+        self.categories = {}    # category -> tuple of rows, in menu order
+        self._rows = {}         # item ID -> row
+        self._home = {}         # item ID -> first category it is listed under
+        self._words = []        # sorted (word, row) pairs for prefix search
+
+    def _add(self, category, name, price, item_id=None):
+        item_id = item_id or item_id_for(name)
+        price = price if isinstance(price, Money) else Money.from_major(price, self.currency)
+        row = self._rows.get(item_id)
+        if row is None:
+            row = len(self.ids)
+            self._rows[item_id] = row
+            self.ids.append(item_id)
+            self.names.append(name)
+            self.prices.append(price)
+        elif self.prices[row] != price:
+            raise ValueError(f"{name} is listed with two different prices")
+        self._home.setdefault(item_id, category)
+        rows = self.categories.setdefault(category, [])
+        if row not in rows:
+            rows.append(row)
+
+    def _compile(self):
+        self.categories = {category: tuple(rows) for category, rows in self.categories.items()}
+        self._words = sorted((word, row) for row, name in enumerate(self.names)
+                             for word in {name.lower(), *name.lower().split()})
+        return self
+
+    # Loaders
+    @classmethod
+    def from_dict(cls, menu, currency="SGD"):
+        """Build from a nested {category: {name: price}} dict"""
+        catalog = cls(currency)
+        for category, items in menu.items():
+            for name, price in items.items():
+                catalog._add(category, name, price)
+        return catalog._compile()
+
+    @classmethod
+    def from_json(cls, path, currency="SGD"):
+        """Load a {category: {name: price}} JSON file"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f), currency)
+
+    @classmethod
+    def from_csv(cls, path, currency="SGD"):
+        """Load a CSV with category, name, price and an optional id column"""
+        catalog = cls(currency)
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                catalog._add(row["category"], row["name"], row["price"], row.get("id") or None)
+        return catalog._compile()
+
+    # Lookups
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, item_id):
+        return item_id in self._rows
+
+    def name(self, item_id):
+        return self.names[self._rows[item_id]]
+
+    def price(self, item_id):
+        return self.prices[self._rows[item_id]]
+
+    def category(self, item_id):
+        """The category an item is reported under (the first one listing it)"""
+        return self._home[item_id]
+
+    def category_items(self, category):
+        """(item ID, name, price) for every item in a category, in menu order"""
+        return [(self.ids[row], self.names[row], self.prices[row]) for row in self.categories[category]]
+
+    def search(self, prefix, limit=10):
+        """Item IDs whose name, or any word of it, starts with prefix (case-insensitive)"""
+        prefix = prefix.lower().strip()
+        if not prefix:
+            return []
+        matches = []
+        start = bisect.bisect_left(self._words, (prefix,))
+        for word, row in itertools.islice(self._words, start, None):
+            if not word.startswith(prefix) or len(matches) >= limit:
+                break
+            if self.ids[row] not in matches:
+                matches.append(self.ids[row])
+        return matches
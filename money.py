@@ -0,0 +1,153 @@
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+
+# ISO 4217 minor-unit exponents; anything not listed uses 2 (cents, paise, ...)
+MINOR_UNITS = {
+    'JPY': 0, 'KRW': 0, 'VND': 0, 'CLP': 0, 'ISK': 0,
+    'BHD': 3, 'KWD': 3, 'OMR': 3, 'JOD': 3, 'TND': 3,
+}
+
+
+def exponent(currency):
+    return MINOR_UNITS.get(currency, 2)
+
+
+@lru_cache(maxsize=256)
+def _ratio(rate):
+    """Exact (numerator, denominator) of a tax or FX rate as written, e.g. 0.09 -> (9, 100)"""
+    return Decimal(str(rate)).as_integer_ratio()
+
+
+def _div_round(numerator, denominator):
+    """Integer division rounding half away from zero (the usual GST/FX policy)"""
+    q, r = divmod(abs(numerator) * 2 + denominator, denominator * 2)
+    return q if (numerator >= 0) == (denominator > 0) else -q
+
+
+class Money:
+    """An exact amount stored as integer minor units (cents, paise, yen) plus a currency code.
+
+    Arithmetic on Money is plain integer arithmetic; rounding only happens
+    when a rate is applied (tax, FX), and then exactly once per operation.
+    """
+
+    __slots__ = ('minor', 'currency')
+
+    def __init__(self, minor, currency):
+        self.minor = int(minor)
+        self.currency = currency
+
+    @classmethod
+    def from_major(cls, amount, currency):
+        """Build from a major-unit amount such as 5.90 or "5.90" (rounded half up)"""
+        minor = Decimal(str(amount)).scaleb(exponent(currency)).quantize(1, rounding=ROUND_HALF_UP)
+        return cls(minor, currency)
+
+    @classmethod
+    def zero(cls, currency):
+        return cls(0, currency)
+
+    @property
+    def decimals(self):
+        return exponent(self.currency)
+
+    @property
+    def amount(self):
+        """The value in major units as an exact Decimal"""
+        return Decimal(self.minor).scaleb(-self.decimals)
+
+    def _minor_of(self, other):
+        if isinstance(other, Money):
+            if other.currency != self.currency:
+                raise ValueError(f"Cannot combine {self.currency} with {other.currency}")
+            return other.minor
+        if other == 0:  # Allows sum() and comparisons against 0
+            return 0
+        return NotImplemented
+
+    # Arithmetic
+    def __add__(self, other):
+        minor = self._minor_of(other)
+        if minor is NotImplemented:
+            return NotImplemented
+        return Money(self.minor + minor, self.currency)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        minor = self._minor_of(other)
+        if minor is NotImplemented:
+            return NotImplemented
+        return Money(self.minor - minor, self.currency)
+
+    def __neg__(self):
+        return Money(-self.minor, self.currency)
+
+    def __abs__(self):
+        return Money(abs(self.minor), self.currency)
+
+    def __mul__(self, quantity):
+        if not isinstance(quantity, int):
+            return NotImplemented
+        return Money(self.minor * quantity, self.currency)
+
+    __rmul__ = __mul__
+
+    def apply_rate(self, rate):
+        """This amount times a rate such as a tax rate (0.09), rounded to the minor unit"""
+        num, den = _ratio(rate)
+        return Money(_div_round(self.minor * num, den), self.currency)
+
+    def convert(self, rate, to_currency):
+        """Convert with an FX rate (units of to_currency per 1 unit of this currency)"""
+        num, den = _ratio(rate)
+        shift = exponent(to_currency) - self.decimals
+        if shift >= 0:
+            num *= 10 ** shift
+        else:
+            den *= 10 ** -shift
+        return Money(_div_round(self.minor * num, den), to_currency)
+
+    def allocate(self, parts):
+        """Split into `parts` shares that differ by at most one minor unit and sum exactly"""
+        share, remainder = divmod(self.minor, parts)
+        return [Money(share + (1 if i < remainder else 0), self.currency) for i in range(parts)]
+
+    # Comparisons
+    def __eq__(self, other):
+        if isinstance(other, Money):
+            return self.currency == other.currency and self.minor == other.minor
+        return other == 0 and self.minor == 0
+
+    def __hash__(self):
+        return hash((self.minor, self.currency))
+
+    def __lt__(self, other):
+        minor = self._minor_of(other)
+        return NotImplemented if minor is NotImplemented else self.minor < minor
+
+    def __le__(self, other):
+        minor = self._minor_of(other)
+        return NotImplemented if minor is NotImplemented else self.minor <= minor
+
+    def __gt__(self, other):
+        minor = self._minor_of(other)
+        return NotImplemented if minor is NotImplemented else self.minor > minor
+
+    def __ge__(self, other):
+        minor = self._minor_of(other)
+        return NotImplemented if minor is NotImplemented else self.minor >= minor
+
+    def __bool__(self):
+        return self.minor != 0
+
+    # Display
+    def __format__(self, spec):
+        """Format the major-unit amount, so f"{price:.2f}" keeps working"""
+        return format(self.amount, spec or f".{self.decimals}f")
+
+    def __str__(self):
+        return f"{self.currency} {self:,}"
+
+    def __repr__(self):
+        return f"Money({self.minor}, {self.currency!r})"
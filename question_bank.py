@@ -0,0 +1,180 @@
+import json
+import random
+import sqlite3
+
+DEFAULT_CATEGORY = "General"
+DEFAULT_DIFFICULTY = "medium"
+
+
+class QuestionBank:
+    """Quiz questions compiled once into parallel arrays indexed by row number.
+
+    Rows are grouped by (category, difficulty), so a quiz is drawn as a
+    stratified sample: each group gets its share of the k questions and
+    random.sample picks row positions from a range, touching only the k
+    rows it returns. Options loaded from SQLite stay as JSON text until
+    their question is drawn.
+    """
+
+    def __init__(self):
+        self.questions = []
+        self.options = []
+        self.answers = []
+        self.strata = {}    # (category, difficulty) -> tuple of rows
+
+    def __len__(self):
+        return len(self.questions)
+
+    def _add(self, question, options, answer, category=None, difficulty=None):
+        if not isinstance(options, str) and answer not in options:
+            raise ValueError(f"Answer to {question!r} is not one of its options")
+        key = (category or DEFAULT_CATEGORY, difficulty or DEFAULT_DIFFICULTY)
+        self.strata.setdefault(key, []).append(len(self.questions))
+        self.questions.append(question)
+        self.options.append(options)
+        self.answers.append(answer)
+
+    def _compile(self):
+        self.strata = {key: tuple(rows) for key, rows in self.strata.items()}
+        return self
+
+    @property
+    def categories(self):
+        return sorted({category for category, _ in self.strata})
+
+    @property
+    def difficulties(self):
+        return sorted({difficulty for _, difficulty in self.strata})
+
+    def count(self, category=None, difficulty=None):
+        return sum(len(rows) for rows in self._groups(category, difficulty))
+
+    # Loaders
+    @classmethod
+    def from_list(cls, questions):
+        """Build from dicts with question, options, answer and optional category/difficulty"""
+        bank = cls()
+        for q in questions:
+            bank._add(q["question"], q["options"], q["answer"], q.get("category"), q.get("difficulty"))
+        return bank._compile()
+
+    @classmethod
+    def from_json(cls, path):
+        """Load a JSON list of question dicts"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_list(json.load(f))
+
+    @classmethod
+    def from_sqlite(cls, path):
+        """Load a questions table; options is a JSON array stored as text"""
+        conn = sqlite3.connect(path)
+        try:
+            rows = conn.execute(
+                "SELECT question, options, answer, category, difficulty FROM questions ORDER BY id")
+            bank = cls()
+            for question, options, answer, category, difficulty in rows:
+                bank._add(question, options, answer, category, difficulty)
+        finally:
+            conn.close()
+        return bank._compile()
+
+    def save_sqlite(self, path):
+        """Write the bank to a questions table that from_sqlite can load"""
+        conn = sqlite3.connect(path)
+        try:
+            with conn:
+                conn.execute("DROP TABLE IF EXISTS questions")
+                conn.execute("""
+                    CREATE TABLE questions (
+                        id INTEGER PRIMARY KEY,
+                        question TEXT NOT NULL,
+                        options TEXT NOT NULL,
+                        answer TEXT NOT NULL,
+                        category TEXT NOT NULL,
+                        difficulty TEXT NOT NULL
+                    )""")
+                conn.executemany(
+                    "INSERT INTO questions (id, question, options, answer, category, difficulty) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    ((row, self.questions[row], self._options_json(row), self.answers[row], category, difficulty)
+                     for (category, difficulty), rows in self.strata.items() for row in rows))
+        finally:
+            conn.close()
+
+    def _options_json(self, row):
+        options = self.options[row]
+        return options if isinstance(options, str) else json.dumps(options)
+
+    # Drawing questions
+    def _groups(self, category=None, difficulty=None):
+        return [rows for (c, d), rows in self.strata.items()
+                if category in (None, c) and difficulty in (None, d)]
+
+    def question(self, row):
+        """Row as the {'question', 'options', 'answer'} dict the quiz shows"""
+        options = self.options[row]
+        if isinstance(options, str):
+            options = self.options[row] = json.loads(options)
+            if self.answers[row] not in options:
+                raise ValueError(f"Answer to {self.questions[row]!r} is not one of its options")
+        return {"question": self.questions[row], "options": list(options), "answer": self.answers[row]}
+
+    def sample(self, k, category=None, difficulty=None, rng=random):
+        """k questions spread over the matching (category, difficulty) groups.
+
+        Each group gets k * its size / total questions, rounded down; the
+        leftover questions go to the groups with the largest remainders,
+        ties broken at random. Raises ValueError if fewer than k match.
+        """
+        groups = self._groups(category, difficulty)
+        total = sum(len(rows) for rows in groups)
+        if k > total:
+            raise ValueError(f"Only {total} questions match, {k} requested")
+        if not k:
+            return []
+        shares = [divmod(k * len(rows), total) for rows in groups]
+        counts = [count for count, _ in shares]
+        leftover = k - sum(counts)
+        for i in sorted(range(len(groups)), key=lambda i: (shares[i][1], rng.random()), reverse=True)[:leftover]:
+            counts[i] += 1
+        rows = [group[i] for group, count in zip(groups, counts) if count
+                for i in rng.sample(range(len(group)), count)]
+        rng.shuffle(rows)
+        return [self.question(row) for row in rows]
+
+
+def benchmark(size=50_000, k=10, quizzes=10_000):
+    """Load a generated bank from JSON and SQLite and time the per-quiz draw"""
+    import os
+    import tempfile
+    import time
+
+    rnd = random.Random(0)
+    questions = [{"question": f"Question {i}?", "options": [f"Option {j}" for j in range(4)],
+                  "answer": f"Option {rnd.randrange(4)}", "category": f"Category {i % 12}",
+                  "difficulty": ("easy", "medium", "hard")[rnd.randrange(3)]} for i in range(size)]
+    folder = tempfile.mkdtemp()
+    json_path = os.path.join(folder, "questions.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(questions, f)
+    db_path = os.path.join(folder, "questions.db")
+    QuestionBank.from_list(questions).save_sqlite(db_path)
+
+    for name, loader, path in [("JSON", QuestionBank.from_json, json_path),
+                               ("SQLite", QuestionBank.from_sqlite, db_path)]:
+        began = time.perf_counter()
+        bank = loader(path)
+        print(f"{name:>7} load: {(time.perf_counter() - began) * 1000:7.1f} ms ({len(bank)} questions, "
+              f"{len(bank.strata)} groups)")
+
+    for label, kwargs in [("all", {}), ("category", {"category": "Category 3"}),
+                          ("difficulty", {"difficulty": "hard"})]:
+        began = time.perf_counter()
+        for _ in range(quizzes):
+            bank.sample(k, **kwargs)
+        elapsed = time.perf_counter() - began
+        print(f"{label:>10} draw: {elapsed / quizzes * 1e6:7.1f} us per {k}-question quiz")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,200 @@
+import json
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+CSV_CHUNK_ROWS = 100_000
+HISTORY_FILE = "rate_history"  # rate_history.f8 (rates) + rate_history.json (layout)
+
+
+class RateTable:
+    """Exchange rates for one snapshot, derived from a single base-rate vector.
+
+    Only "units of each currency per 1 base unit" is stored; the full
+    cross-rate matrix is built as an outer division, so every pair is
+    mutually consistent (A->B x B->A == 1) and adding a currency costs one
+    number instead of a new row and column.
+    """
+
+    def __init__(self, base_rates, base="USD", as_of=None):
+        if base_rates.get(base) != 1.0:
+            raise ValueError(f"Base currency {base} must have a rate of 1.0")
+        self.base = base
+        self.as_of = as_of
+        self.codes = list(base_rates)
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        self.base_vector = np.array([base_rates[code] for code in self.codes], dtype=np.float64)
+        # matrix[i, j] = units of currency j per 1 unit of currency i
+        self.matrix = self.base_vector[np.newaxis, :] / self.base_vector[:, np.newaxis]
+
+    @classmethod
+    def from_json(cls, path):
+        """Load a snapshot file: {"base": "USD", "as_of": "...", "rates": {"INR": 83.25, ...}}"""
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        return cls(snapshot["rates"], base=snapshot.get("base", "USD"), as_of=snapshot.get("as_of"))
+
+    def __contains__(self, code):
+        return code in self.index
+
+    def __len__(self):
+        return len(self.codes)
+
+    def rate(self, from_currency, to_currency):
+        """Units of to_currency per 1 from_currency (KeyError for unknown codes)"""
+        return self.matrix[self.index[from_currency], self.index[to_currency]]
+
+    def convert(self, amount, from_currency, to_currency):
+        return amount * self.rate(from_currency, to_currency)
+
+    def _indices(self, codes, size):
+        """Matrix indices for an array (or a single code) of currency codes; -1 if unknown"""
+        codes = np.asarray(codes)
+        if codes.ndim == 0:
+            return np.full(size, self.index.get(str(codes), -1))
+        unique, inverse = np.unique(codes.astype(str), return_inverse=True)
+        lookup = np.array([self.index.get(code, -1) for code in unique], dtype=np.intp)
+        return lookup[inverse.reshape(-1)]
+
+    def convert_many(self, amounts, from_codes, to_codes):
+        """Vectorized convert over arrays of amounts and currency codes.
+
+        Codes may be arrays of the same length as amounts or single codes.
+        Rows with an unknown currency come back as NaN.
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)
+        from_idx = self._indices(from_codes, amounts.size)
+        to_idx = self._indices(to_codes, amounts.size)
+        rates = self.matrix[from_idx, to_idx]
+        rates[(from_idx < 0) | (to_idx < 0)] = np.nan
+        return amounts * rates
+
+    def convert_csv(self, source, destination, amount_col="amount", from_col="from",
+                    to_col="to", chunksize=CSV_CHUNK_ROWS):
+        """Stream a ledger CSV through convert_many chunk by chunk.
+
+        Writes every input column plus 'converted_amount' to destination and
+        returns (rows converted, rows with an unknown currency). Only one
+        chunk is held in memory at a time. destination may be a path or an
+        open text file; a path is opened once for all chunks.
+        """
+        rows = failed = 0
+        header = True
+        owned = isinstance(destination, (str, os.PathLike))
+        out = open(destination, "w", encoding="utf-8", newline="") if owned else destination
+        try:
+            for chunk in pd.read_csv(source, chunksize=chunksize):
+                converted = self.convert_many(chunk[amount_col].to_numpy(),
+                                              chunk[from_col].to_numpy(),
+                                              chunk[to_col].to_numpy())
+                chunk["converted_amount"] = converted
+                chunk.to_csv(out, index=False, header=header)
+                header = False
+                rows += len(chunk)
+                failed += int(np.isnan(converted).sum())
+        finally:
+            if owned:
+                out.close()
+        return rows, failed
+
+
+class RateHistory:
+    """Daily base-rate vectors stored as one memory-mapped (days x currencies) array.
+
+    Row i holds the base rates for start_date + i days, as raw float64 in
+    <path>.f8; the currency order and start date live in <path>.json. Rows
+    and single-currency columns are zero-copy views of the mapped file, so
+    converting at a past date or charting a pair over years never reparses
+    anything. Days without data are NaN.
+    """
+
+    def __init__(self, path=HISTORY_FILE):
+        self.data_path = path + ".f8"
+        self.meta_path = path + ".json"
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.base = meta["base"]
+        self.codes = meta["codes"]
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        self.start_date = date.fromisoformat(meta["start_date"])
+        self._rates = None
+        self._mapped_size = None
+
+    @classmethod
+    def create(cls, codes, start_date, base="USD", path=HISTORY_FILE):
+        """Start an empty history for a fixed list of currency codes"""
+        with open(path + ".json", "w", encoding="utf-8") as f:
+            json.dump({"base": base, "codes": list(codes),
+                       "start_date": start_date.isoformat()}, f)
+        open(path + ".f8", "wb").close()
+        return cls(path)
+
+    def __contains__(self, code):
+        return code in self.index
+
+    @property
+    def rates(self):
+        """The (days x currencies) array, re-mapped only when the file has grown"""
+        size = os.path.getsize(self.data_path)
+        if size != self._mapped_size:
+            days = size // (8 * len(self.codes))
+            if days == 0:
+                self._rates = np.empty((0, len(self.codes)))
+            else:
+                self._rates = np.memmap(self.data_path, dtype=np.float64, mode="r",
+                                        shape=(days, len(self.codes)))
+            self._mapped_size = size
+        return self._rates
+
+    @property
+    def end_date(self):
+        """Last day with a row, or None when empty"""
+        days = len(self.rates)
+        return self.start_date + timedelta(days=days - 1) if days else None
+
+    def _day(self, on_date):
+        return (on_date - self.start_date).days
+
+    def record(self, on_date, base_rates):
+        """Append the base rates for a day (must be after the last recorded day).
+
+        Missing days in between and unknown currencies are stored as NaN.
+        """
+        day = self._day(on_date)
+        days = len(self.rates)
+        if day < days:
+            raise ValueError(f"Rates for {on_date} are already recorded")
+        rows = np.full((day - days + 1, len(self.codes)), np.nan)
+        for code, rate in base_rates.items():
+            if code in self.index:
+                rows[-1, self.index[code]] = rate
+        with open(self.data_path, "ab") as f:
+            f.write(rows.tobytes())
+
+    def vector(self, on_date):
+        """Zero-copy base-rate row for a day (KeyError if outside the history)"""
+        day = self._day(on_date)
+        if not 0 <= day < len(self.rates):
+            raise KeyError(on_date)
+        return self.rates[day]
+
+    def table_on(self, on_date):
+        """RateTable for the snapshot of a given day"""
+        row = self.vector(on_date)
+        return RateTable(dict(zip(self.codes, row.tolist())), base=self.base,
+                         as_of=on_date.isoformat())
+
+    def convert(self, amount, from_currency, to_currency, on_date):
+        row = self.vector(on_date)
+        return amount * row[self.index[to_currency]] / row[self.index[from_currency]]
+
+    def series(self, from_currency, to_currency, start_date=None, end_date=None):
+        """Daily from->to rates between two dates as a pandas Series indexed by date"""
+        first = max(self._day(start_date), 0) if start_date else 0
+        last = min(self._day(end_date) + 1, len(self.rates)) if end_date else len(self.rates)
+        window = self.rates[first:last]
+        values = window[:, self.index[to_currency]] / window[:, self.index[from_currency]]
+        dates = pd.date_range(self.start_date + timedelta(days=first), periods=len(values), freq="D")
+        return pd.Series(values, index=dates, name=f"{from_currency}/{to_currency}")
@@ -0,0 +1,92 @@
+import os
+
+RECEIPT_WIDTH = 42  # Characters per line on a 80 mm printer with font A
+RECEIPT_FILE = "receipts.txt"
+RECEIPT_PRINTER = os.environ.get("RECEIPT_PRINTER")  # e.g. /dev/usb/lp0; None means RECEIPT_FILE
+
+# ESC/POS control sequences
+ESC_INIT = b"\x1b@"
+ESC_BOLD_ON = b"\x1bE\x01"
+ESC_BOLD_OFF = b"\x1bE\x00"
+ESC_CENTER = b"\x1ba\x01"
+ESC_LEFT = b"\x1ba\x00"
+ESC_DOUBLE = b"\x1d!\x11"
+ESC_NORMAL = b"\x1d!\x00"
+ESC_FEED_CUT = b"\n\n\n\x1dV\x01"
+
+
+class ReceiptRenderer:
+    """Fixed-width text receipts, optionally wrapped in ESC/POS printer codes.
+
+    The shop header and footer are encoded once; each receipt only formats
+    its own lines into one bytes object, which is appended to a file or
+    written straight to a printer device. Takes the same invoice dict as
+    InvoiceRenderer.
+    """
+
+    def __init__(self, width=RECEIPT_WIDTH, escpos=True):
+        self.width = width
+        self.escpos = escpos
+        rule = "-" * width + "\n"
+        self.rule = rule.encode("ascii")
+        if escpos:
+            self.header = (ESC_INIT + ESC_CENTER + ESC_DOUBLE + b"SPICE GARDEN\n" + ESC_NORMAL
+                           + b"Authentic Indian Cuisine\n"
+                           + b"123 Little India Road, Singapore 123456\n"
+                           + b"Tel: +65 6123 4567\n" + ESC_LEFT + self.rule)
+            self.footer = (self.rule + ESC_CENTER + b"Thank you for dining at Spice Garden!\n"
+                           + ESC_LEFT + ESC_FEED_CUT)
+            self.bold_on, self.bold_off = ESC_BOLD_ON, ESC_BOLD_OFF
+        else:
+            self.header = ("SPICE GARDEN".center(width) + "\n"
+                           + "Authentic Indian Cuisine".center(width) + "\n"
+                           + "123 Little India Road, Singapore 123456".center(width) + "\n"
+                           + "Tel: +65 6123 4567".center(width) + "\n" + rule).encode("ascii")
+            self.footer = (rule + "Thank you for dining at Spice Garden!".center(width) + "\n\n").encode("ascii")
+            self.bold_on = self.bold_off = b""
+
+    def render(self, invoice):
+        """The complete receipt as bytes"""
+        width = self.width
+        name_width = width - 15
+        currency = invoice["currency"]
+        body = [f"Invoice #: {invoice['number']}", f"Date: {invoice['date']}", "-" * width]
+        for name, quantity, price in invoice["lines"]:
+            body.append(f"{quantity:>3} {name[:name_width]:<{name_width}}{price * quantity:>11.2f}")
+        body.append("-" * width)
+        body.append(f"{'Subtotal ' + currency:>{width - 12}}{invoice['subtotal']:>12.2f}")
+        body.append(f"{invoice['tax_label'] + ' ' + currency:>{width - 12}}{invoice['tax']:>12.2f}")
+        text = "\n".join(body).encode("ascii", "replace")
+        total = f"{'TOTAL ' + currency:>{width - 12}}{invoice['total']:>12.2f}\n".encode("ascii")
+        return b"".join((self.header, text, b"\n", self.bold_on, total, self.bold_off, self.footer))
+
+    def print_receipt(self, invoice, target=None):
+        """Append the receipt to a file or send it to a printer device; returns the target"""
+        target = target or RECEIPT_PRINTER or RECEIPT_FILE
+        data = self.render(invoice)
+        with open(target, "ab", buffering=0) as f:
+            f.write(data)
+        return target
+
+
+def benchmark(receipts=10_000):
+    """Formatting time per receipt for a typical 8-line order"""
+    import time
+    from money import Money
+
+    price = Money(1890, "SGD")
+    invoice = {'number': "SG00000042", 'date': "18-10-2026 12:00:00", 'currency': "SGD",
+               'lines': [(f"Menu Item {i}", i % 3 + 1, price) for i in range(8)],
+               'subtotal': price * 16, 'tax_label': "GST (9%)", 'tax': Money(2722, "SGD"),
+               'total': price * 16 + Money(2722, "SGD")}
+    for escpos in (False, True):
+        renderer = ReceiptRenderer(escpos=escpos)
+        began = time.perf_counter()
+        for _ in range(receipts):
+            renderer.render(invoice)
+        elapsed = time.perf_counter() - began
+        print(f"{'ESC/POS' if escpos else 'plain text':>10}: {elapsed / receipts * 1e6:6.1f} us per receipt")
+
+
+if __name__ == "__main__":
+    benchmark()
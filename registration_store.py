@@ -0,0 +1,642 @@
+import csv
+import io
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+
+import pandas as pd
+
+from file_lock import locked
+
+CSV_FILE = "registrations.csv"
+DB_FILE = "registrations.db"  # Index over the CSV, plus the waitlist, which is stored only here
+FIELDS = ["Name", "Major", "Phone", "Event", "Timestamp"]
+BATCH_SIZE = 500  # Most rows written per lock/fsync
+COLUMNS = {"Name": "name", "Major": "major", "Phone": "phone", "Event": "event", "Timestamp": "timestamp"}
+EXPORT_CHUNK_ROWS = 10_000
+CONFIRMED, WAITLISTED, DUPLICATE = "confirmed", "waitlisted", "duplicate"
+# Export format -> (file extension, MIME type); Parquet needs pyarrow, Excel needs openpyxl
+EXPORT_FORMATS = {
+    "CSV": (".csv", "text/csv"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+    "Excel": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+
+def read_appended(path, offset=0):
+    """(header, rows, new offset) for the complete CSV rows after a byte offset.
+
+    Rows are dicts keyed by the header; rows with the wrong number of fields
+    (a torn write) are skipped. A last row still missing its newline is left
+    for the next call.
+    """
+    with open(path, "rb") as f:
+        first = f.readline()
+        if not first.endswith(b"\n"):
+            return None, [], 0
+        header = next(csv.reader([first.decode("utf-8", "replace")]))
+        start = max(offset, len(first))
+        f.seek(start)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    rows = [dict(zip(header, row))
+            for row in csv.reader(data[:end].decode("utf-8", "replace").splitlines())
+            if len(row) == len(header)]
+    return header, rows, start + end
+
+
+class RegistrationWriter:
+    """Serializes every append to registrations.csv through one writer thread.
+
+    Sessions hand rows to a queue and wait for the returned future. The
+    writer drains whatever has queued up (up to BATCH_SIZE rows), takes an
+    advisory lock on the file, and writes the header (if the file is empty)
+    plus the whole batch as a single fsync'd append. Rows from different
+    sessions or processes therefore never interleave, and a rush of
+    submissions costs one lock and one fsync per batch instead of per row.
+    """
+
+    def __init__(self, path=CSV_FILE, batch_size=BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.batches = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="registration-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, row):
+        """Queue one row (a dict with FIELDS); the future resolves once it is on disk"""
+        future = Future()
+        self._queue.put((dict(row), future))
+        return future
+
+    def append(self, row, timeout=30):
+        """Queue one row and wait until it has been written"""
+        return self.submit(row).result(timeout)
+
+    def close(self):
+        """Write everything still queued and stop the writer thread"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._write(batch)
+                    return
+                batch.append(item)
+            self._write(batch)
+
+    def _encode(self, rows, header):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+        if header:
+            writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue().encode("utf-8")
+
+    def _write(self, batch):
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                with locked(fd):
+                    size = os.fstat(fd).st_size
+                    data = self._encode([row for row, _ in batch], header=size == 0)
+                    if size:
+                        os.lseek(fd, size - 1, os.SEEK_SET)
+                        if os.read(fd, 1) != b"\n":
+                            data = b"\r\n" + data  # Terminate a torn row left by a crashed writer
+                    os.write(fd, data)
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        self.batches += 1
+        for row, future in batch:
+            future.set_result(row)
+
+
+class RegistrationStats:
+    """Per-event counts, total and latest timestamp for registrations.csv.
+
+    The file is only looked at again when its size or mtime changes, and
+    then only the bytes appended since the last look are parsed. A file
+    that shrank or was replaced is re-read from the start. A trailing row
+    without its newline yet is left for the next refresh.
+    """
+
+    def __init__(self, path=CSV_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.total = 0
+        self.event_counts = {}
+        self.latest = None
+        self._offset = 0
+        self._signature = None
+
+    def refresh(self):
+        """Fold in newly appended rows; returns self for chaining"""
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                self._reset()
+                return self
+            signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            if signature == self._signature:
+                return self
+            if self._signature and (stat.st_ino != self._signature[0] or stat.st_size < self._offset):
+                self._reset()
+
+            _, rows, self._offset = read_appended(self.path, self._offset)
+            self._signature = signature
+            for row in rows:
+                self._count(row["Event"], row["Timestamp"])
+        return self
+
+    def _count(self, event, timestamp):
+        self.total += 1
+        self.event_counts[event] = self.event_counts.get(event, 0) + 1
+        if self.latest is None or timestamp > self.latest:
+            self.latest = timestamp
+
+    def by_event(self):
+        """(event, count) pairs, most registrations first"""
+        return sorted(self.event_counts.items(), key=lambda item: -item[1])
+
+
+class RegistrationIndex:
+    """SQLite mirror of registrations.csv plus a (phone, event) uniqueness index.
+
+    The CSV stays the source of truth for confirmed registrations. sync()
+    imports the rows appended since the byte offset recorded in the
+    database, and re-imports the whole file after it was replaced or
+    truncated, so the mirror, keys and seat counts can always be rebuilt
+    from the CSV. The waitlist is the exception: waitlisted rows are never
+    written to the CSV and live only in this database, which survives a
+    rebuild but not deletion of the database file. Keep the file (or
+    export the waitlist) to keep the queue.
+
+    New registrations go through reserve(), which in one IMMEDIATE
+    transaction claims the (phone, event) key (the primary key turns a
+    duplicate into a single index lookup) and takes a seat from the event's
+    counter, or joins the event's waitlist once it is full. SQLite
+    serializes those transactions across sessions and processes, so an
+    event can never be oversubscribed. Releasing a confirmed seat promotes
+    the head of the event's waitlist in the same transaction.
+    """
+
+    def __init__(self, path=DB_FILE, csv_path=CSV_FILE):
+        self.path = path
+        self.csv_path = csv_path
+        self._lock = threading.Lock()
+        self._seen = None
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS registrations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    major TEXT NOT NULL,
+                    phone TEXT NOT NULL,
+                    event TEXT NOT NULL,
+                    timestamp TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS registration_keys (
+                    phone TEXT NOT NULL,
+                    event TEXT NOT NULL,
+                    PRIMARY KEY (phone, event)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    csv_offset INTEGER NOT NULL,
+                    csv_ino INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS event_seats (
+                    event TEXT PRIMARY KEY,
+                    capacity INTEGER,
+                    taken INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS waitlist (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    major TEXT NOT NULL,
+                    phone TEXT NOT NULL,
+                    event TEXT NOT NULL,
+                    timestamp TEXT NOT NULL
+                );
+                INSERT OR IGNORE INTO sync_state (id, csv_offset, csv_ino) VALUES (1, 0, 0);
+                CREATE INDEX IF NOT EXISTS idx_keys_event ON registration_keys (event);
+                CREATE INDEX IF NOT EXISTS idx_waitlist_event ON waitlist (event, id);
+                CREATE INDEX IF NOT EXISTS idx_waitlist_phone ON waitlist (phone, event);
+                CREATE INDEX IF NOT EXISTS idx_registrations_name ON registrations (name);
+                CREATE INDEX IF NOT EXISTS idx_registrations_major ON registrations (major);
+                CREATE INDEX IF NOT EXISTS idx_registrations_phone ON registrations (phone);
+                CREATE INDEX IF NOT EXISTS idx_registrations_timestamp ON registrations (timestamp);
+                CREATE INDEX IF NOT EXISTS idx_registrations_event_timestamp ON registrations (event, timestamp);
+                CREATE INDEX IF NOT EXISTS idx_registrations_event_name ON registrations (event, name);
+            """)
+        self.sync()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def sync(self):
+        """Bring the mirror up to date with the CSV; returns the number of rows imported.
+
+        A rebuild keeps the waitlist table, which has no copy in the CSV.
+        """
+        try:
+            stat = os.stat(self.csv_path)
+        except FileNotFoundError:
+            stat = None
+        signature = stat and (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            if signature is not None and signature == self._seen:
+                return 0
+            self._conn.execute("BEGIN IMMEDIATE")  # One syncing process at a time
+            try:
+                # Look again under the lock: another process may have synced newer rows meanwhile
+                try:
+                    stat = os.stat(self.csv_path)
+                except FileNotFoundError:
+                    stat = None
+                signature = stat and (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+                offset, ino = self._conn.execute(
+                    "SELECT csv_offset, csv_ino FROM sync_state").fetchone()
+                rebuilt = bool(ino and (stat is None or stat.st_ino != ino or stat.st_size < offset))
+                if rebuilt:
+                    # Deleted, replaced or truncated CSV: rebuild from scratch (waitlist included)
+                    self._conn.execute("DELETE FROM registrations")
+                    self._conn.execute("DELETE FROM registration_keys")
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO registration_keys (phone, event) SELECT phone, event FROM waitlist")
+                    offset = 0
+                rows = []
+                if stat is not None:
+                    _, rows, offset = read_appended(self.csv_path, offset)
+                values = [(row["Name"], row["Major"], row["Phone"], row["Event"], row["Timestamp"])
+                          for row in rows]
+                self._conn.executemany(
+                    "INSERT INTO registrations (name, major, phone, event, timestamp) "
+                    "VALUES (?, ?, ?, ?, ?)", values)
+                new_keys = self._conn.executemany(
+                    "INSERT OR IGNORE INTO registration_keys (phone, event) VALUES (?, ?)",
+                    [(phone, event) for _, _, phone, event, _ in values]).rowcount
+                if rebuilt or new_keys > 0:
+                    # Rows that did not come through reserve(): recount the seats
+                    self._recount_seats()
+                self._conn.execute("UPDATE sync_state SET csv_offset = ?, csv_ino = ?",
+                                   (offset, stat.st_ino if stat else 0))
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._seen = signature
+            return len(values)
+
+    def is_registered(self, phone, event):
+        return bool(self._query("SELECT 1 FROM registration_keys WHERE phone = ? AND event = ?",
+                                (phone, event)))
+
+    def _recount_seats(self):
+        """Reset every event's taken seats to its registered, non-waitlisted keys"""
+        self._conn.execute("INSERT OR IGNORE INTO event_seats (event) SELECT DISTINCT event FROM registration_keys")
+        self._conn.execute("""
+            UPDATE event_seats SET taken = (
+                SELECT COUNT(*) FROM registration_keys k WHERE k.event = event_seats.event
+                AND NOT EXISTS (SELECT 1 FROM waitlist w WHERE w.phone = k.phone AND w.event = k.event)
+            )
+        """)
+
+    # Capacity and seat allocation
+    def set_capacity(self, event, capacity):
+        """Limit an event to capacity seats (None for unlimited); existing seats are kept"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO event_seats (event, capacity) VALUES (?, ?) "
+                "ON CONFLICT (event) DO UPDATE SET capacity = excluded.capacity", (event, capacity))
+
+    def seats(self):
+        """{event: (taken, capacity, waitlisted)}; capacity is None when unlimited"""
+        waiting = dict(self._query("SELECT event, COUNT(*) FROM waitlist GROUP BY event"))
+        return {event: (taken, capacity, waiting.get(event, 0))
+                for event, taken, capacity in self._query("SELECT event, taken, capacity FROM event_seats")}
+
+    def waitlist(self, event):
+        """Waitlisted registrations for an event in queue order, as dicts with FIELDS"""
+        rows = self._query("SELECT name, major, phone, event, timestamp FROM waitlist "
+                           "WHERE event = ? ORDER BY id", (event,))
+        return [dict(zip(FIELDS, row)) for row in rows]
+
+    def reserve(self, row):
+        """Claim a seat for a registration row (a dict with FIELDS).
+
+        Returns (CONFIRMED, None), (WAITLISTED, position in the queue) or
+        (DUPLICATE, None) if the phone already holds a seat or a waitlist
+        place for the event. Confirmed rows still have to be written to
+        the CSV; waitlisted rows are kept in the database only.
+        """
+        self.sync()
+        phone, event = row["Phone"], row["Event"]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                try:
+                    self._conn.execute("INSERT INTO registration_keys (phone, event) VALUES (?, ?)",
+                                       (phone, event))
+                except sqlite3.IntegrityError:
+                    self._conn.rollback()
+                    return DUPLICATE, None
+                self._conn.execute("INSERT OR IGNORE INTO event_seats (event) VALUES (?)", (event,))
+                seated = self._conn.execute(
+                    "UPDATE event_seats SET taken = taken + 1 "
+                    "WHERE event = ? AND (capacity IS NULL OR taken < capacity)", (event,)).rowcount
+                if seated:
+                    result = CONFIRMED, None
+                else:
+                    waitlist_id = self._conn.execute(
+                        "INSERT INTO waitlist (name, major, phone, event, timestamp) VALUES (?, ?, ?, ?, ?)",
+                        [row[field] for field in FIELDS]).lastrowid
+                    position = self._conn.execute(
+                        "SELECT COUNT(*) FROM waitlist WHERE event = ? AND id <= ?",
+                        (event, waitlist_id)).fetchone()[0]
+                    result = WAITLISTED, position
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        return result
+
+    def release(self, phone, event):
+        """Give back a reservation, e.g. when its CSV row could not be written.
+
+        If it held a confirmed seat, the first waitlisted registration for
+        the event takes that seat and is returned as a dict with FIELDS;
+        the caller writes it to the CSV. Returns None otherwise.
+        """
+        with self._lock, self._conn:
+            deleted = self._conn.execute("DELETE FROM waitlist WHERE phone = ? AND event = ?",
+                                         (phone, event)).rowcount
+            released = self._conn.execute("DELETE FROM registration_keys WHERE phone = ? AND event = ?",
+                                          (phone, event)).rowcount
+            if not released or deleted:
+                return None
+            self._conn.execute("UPDATE event_seats SET taken = taken - 1 WHERE event = ?", (event,))
+            head = self._conn.execute(
+                "SELECT id, name, major, phone, event, timestamp FROM waitlist "
+                "WHERE event = ? ORDER BY id LIMIT 1", (event,)).fetchone()
+            if head is None:
+                return None
+            seated = self._conn.execute(
+                "UPDATE event_seats SET taken = taken + 1 "
+                "WHERE event = ? AND (capacity IS NULL OR taken < capacity)", (event,)).rowcount
+            if not seated:
+                return None
+            self._conn.execute("DELETE FROM waitlist WHERE id = ?", (head[0],))
+            return dict(zip(FIELDS, head[1:]))
+
+    # Paged queries for the admin view
+    @staticmethod
+    def _where(filters):
+        """WHERE clauses for {column: text}; Event matches exactly, Phone by prefix, the rest by substring"""
+        clauses, params = [], []
+        for column, value in (filters or {}).items():
+            if not value:
+                continue
+            field = COLUMNS[column]
+            if column == "Event":
+                clauses.append(f"{field} = ?")
+                params.append(value)
+            elif column == "Phone":
+                clauses.append(f"{field} >= ? AND {field} < ?")
+                params.extend([value, value + "\uffff"])
+            else:
+                clauses.append(f"{field} LIKE ? ESCAPE '\\'")
+                escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                params.append(f"%{escaped}%")
+        return clauses, params
+
+    def count(self, filters=None):
+        """Number of registrations matching the filters"""
+        self.sync()
+        clauses, params = self._where(filters)
+        sql = "SELECT COUNT(*) FROM registrations"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return self._query(sql, params)[0][0]
+
+    def page(self, filters=None, sort="Timestamp", descending=False, limit=50, offset=0, after=None):
+        """One page of matching registrations as a DataFrame, plus the key for the next page.
+
+        Pass the returned key back as `after` to fetch the next page by keyset
+        (an index seek, however deep the page); `offset` is available for
+        jumping straight to a page. The key is None on the last page.
+        """
+        self.sync()
+        field = COLUMNS[sort]
+        direction, compare = ("DESC", "<") if descending else ("ASC", ">")
+        clauses, params = self._where(filters)
+        if after is not None:
+            clauses.append(f"({field}, id) {compare} (?, ?)")
+            params.extend(after)
+        sql = "SELECT id, name, major, phone, event, timestamp FROM registrations"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {field} {direction}, id {direction} LIMIT ? OFFSET ?"
+        rows = self._query(sql, params + [limit + 1, 0 if after is not None else offset])
+
+        next_key = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_key = (last[list(COLUMNS).index(sort) + 1], last[0])
+        frame = pd.DataFrame([row[1:] for row in rows], columns=FIELDS,
+                             index=pd.Index([row[0] for row in rows], name="#"))
+        return frame, next_key
+
+    def iter_chunks(self, filters=None, chunksize=EXPORT_CHUNK_ROWS):
+        """Matching rows in registration order, as lists of (Name, ..., Timestamp) tuples.
+
+        Each chunk is fetched by keyset on id, so only one chunk is in memory.
+        """
+        self.sync()
+        clauses, params = self._where(filters)
+        sql = "SELECT id, name, major, phone, event, timestamp FROM registrations WHERE id > ?"
+        if clauses:
+            sql += " AND " + " AND ".join(clauses)
+        sql += " ORDER BY id LIMIT ?"
+        last_id = 0
+        while True:
+            rows = self._query(sql, [last_id] + params + [chunksize])
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [row[1:] for row in rows]
+
+
+def _export_csv(chunks, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        for chunk in chunks:
+            writer.writerows(chunk)
+
+
+def _export_parquet(chunks, path):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(field, pa.string()) for field in FIELDS[:-1]]
+                       + [("Timestamp", pa.timestamp("s"))])
+    writer = pq.ParquetWriter(path, schema, compression="zstd")
+    try:
+        for chunk in chunks:
+            columns = [pa.array(column, pa.string()) for column in zip(*chunk)]
+            columns[-1] = pc.strptime(columns[-1], format="%Y-%m-%d %H:%M:%S", unit="s", error_is_null=True)
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+    finally:
+        writer.close()
+
+
+def _export_excel(chunks, path):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)  # Rows are streamed to disk as they are appended
+    sheet = workbook.create_sheet("Registrations")
+    sheet.append(FIELDS)
+    for chunk in chunks:
+        for row in chunk:
+            sheet.append(row)
+    workbook.save(path)
+
+
+def export_registrations(index, fmt, path, filters=None, chunksize=EXPORT_CHUNK_ROWS):
+    """Write matching registrations to path as CSV, Parquet (zstd) or Excel, chunk by chunk"""
+    writers = {"CSV": _export_csv, "Parquet": _export_parquet, "Excel": _export_excel}
+    if fmt not in writers:
+        raise ValueError(f"Unknown export format: {fmt}")
+    writers[fmt](index.iter_chunks(filters, chunksize), path)
+    return path
+
+
+def benchmark(students=2000):
+    """Simulate a registration rush: every student submits from their own thread"""
+    import tempfile
+    import time
+    from datetime import datetime
+
+    path = os.path.join(tempfile.mkdtemp(), "registrations.csv")
+    writer = RegistrationWriter(path)
+    events = ["Dance", "Singing", "Mono acting", "Standup comedy"]
+
+    def register(i):
+        writer.append({"Name": f"Student {i}", "Major": "Computer Science, Year 2",
+                       "Phone": f"9{i:09d}", "Event": events[i % 4],
+                       "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+
+    threads = [threading.Thread(target=register, args=(i,)) for i in range(students)]
+    began = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    writer.close()
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    phones = {row["Phone"] for row in rows}
+    print(f"{students} registrations in {elapsed:.2f} s using {writer.batches} batched writes; "
+          f"{len(rows)} rows read back, {len(phones)} distinct, "
+          f"{'OK' if len(rows) == len(phones) == students else 'MISMATCH'}")
+
+
+def capacity_load_test(registrations=1000, capacity=100, connections=8):
+    """1,000 students register at once, 10% of them twice, over several database connections.
+
+    Each connection stands in for a separate server process. Checks that no
+    event is oversubscribed and every request was confirmed, waitlisted or
+    rejected as a duplicate exactly once.
+    """
+    import random
+    import tempfile
+    import time
+    from datetime import datetime
+
+    folder = tempfile.mkdtemp()
+    csv_path = os.path.join(folder, "registrations.csv")
+    db_path = os.path.join(folder, "registrations.db")
+    indexes = [RegistrationIndex(db_path, csv_path) for _ in range(connections)]
+    events = ["Dance", "Singing", "Mono acting", "Standup comedy"]
+    for event in events:
+        indexes[0].set_capacity(event, capacity)
+    writer = RegistrationWriter(csv_path)
+
+    random.seed(0)
+    students = [(f"9{i:09d}", random.choice(events)) for i in range(registrations)]
+    requests = students + random.sample(students, registrations // 10)
+    random.shuffle(requests)
+    outcomes = {CONFIRMED: 0, WAITLISTED: 0, DUPLICATE: 0}
+    outcome_lock = threading.Lock()
+    start = threading.Barrier(len(requests))
+
+    def register(i, phone, event):
+        row = {"Name": f"Student {phone}", "Major": "Physics", "Phone": phone, "Event": event,
+               "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+        index = indexes[i % connections]
+        start.wait()
+        status, _ = index.reserve(row)
+        if status == CONFIRMED:
+            writer.append(row)
+        with outcome_lock:
+            outcomes[status] += 1
+
+    threads = [threading.Thread(target=register, args=(i, phone, event))
+               for i, (phone, event) in enumerate(requests)]
+    began = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    writer.close()
+
+    wanted = {event: sum(1 for _, e in students if e == event) for event in events}
+    seats = indexes[0].seats()
+    _, rows, _ = read_appended(csv_path)
+    ok = (all(taken == min(capacity, wanted[event]) and waiting == wanted[event] - taken
+              for event, (taken, _, waiting) in seats.items())
+          and outcomes[DUPLICATE] == len(requests) - registrations
+          and len(rows) == outcomes[CONFIRMED] == sum(taken for taken, _, _ in seats.values()))
+    print(f"{len(requests)} simultaneous requests in {elapsed:.2f} s: {outcomes[CONFIRMED]} confirmed, "
+          f"{outcomes[WAITLISTED]} waitlisted, {outcomes[DUPLICATE]} duplicates; "
+          f"{len(rows)} CSV rows; {'OK' if ok else 'MISMATCH'}")
+    for event in events:
+        taken, cap, waiting = seats[event]
+        print(f"  {event:<15} {taken:>4}/{cap} seats, {waiting:>4} waitlisted")
+
+
+if __name__ == "__main__":
+    benchmark()
+    capacity_load_test()
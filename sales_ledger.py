@@ -0,0 +1,188 @@
+import sqlite3
+import threading
+from datetime import datetime
+
+from money import Money
+
+DB_FILE = "sales_ledger.db"
+INVOICE_PREFIX = "SG"
+
+
+def invoice_label(invoice_no):
+    """Printed form of an invoice number, e.g. 42 -> "SG00000042" """
+    return f"{INVOICE_PREFIX}{invoice_no:08d}"
+
+
+class SalesLedger:
+    """Append-only SQLite record of every order and its line items.
+
+    Invoice numbers come from an AUTOINCREMENT key, so they are unique and
+    only ever increase, even across restarts. Triggers reject UPDATE and
+    DELETE. Alongside the raw rows, a per-day/per-item rollup is upserted in
+    the same transaction, so category and item reports over a year read a
+    few thousand rollup rows instead of every line item.
+    """
+
+    def __init__(self, path=DB_FILE, currency="SGD"):
+        self.path = path
+        self.currency = currency
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS orders (
+                    invoice_no INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created_at TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    subtotal INTEGER NOT NULL,
+                    tax INTEGER NOT NULL,
+                    total INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS order_items (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    invoice_no INTEGER NOT NULL REFERENCES orders (invoice_no),
+                    day TEXT NOT NULL,
+                    item_id TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    quantity INTEGER NOT NULL,
+                    unit_price INTEGER NOT NULL,
+                    line_total INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS daily_item_sales (
+                    day TEXT NOT NULL,
+                    item_id TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    quantity INTEGER NOT NULL,
+                    revenue INTEGER NOT NULL,
+                    PRIMARY KEY (day, item_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_orders_day
+                    ON orders (day, subtotal, tax, total);
+                CREATE INDEX IF NOT EXISTS idx_items_invoice ON order_items (invoice_no);
+                CREATE TRIGGER IF NOT EXISTS orders_no_update BEFORE UPDATE ON orders
+                    BEGIN SELECT RAISE(ABORT, 'sales ledger is append-only'); END;
+                CREATE TRIGGER IF NOT EXISTS orders_no_delete BEFORE DELETE ON orders
+                    BEGIN SELECT RAISE(ABORT, 'sales ledger is append-only'); END;
+                CREATE TRIGGER IF NOT EXISTS order_items_no_update BEFORE UPDATE ON order_items
+                    BEGIN SELECT RAISE(ABORT, 'sales ledger is append-only'); END;
+                CREATE TRIGGER IF NOT EXISTS order_items_no_delete BEFORE DELETE ON order_items
+                    BEGIN SELECT RAISE(ABORT, 'sales ledger is append-only'); END;
+            """)
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _money(self, minor):
+        return Money(minor or 0, self.currency)
+
+    def record_order(self, lines, tax, created_at=None):
+        """Append one order and return its new invoice number.
+
+        lines are (item_id, name, category, quantity, unit_price) with
+        Money prices; the order and its items are written in one transaction.
+        """
+        created_at = created_at or datetime.now()
+        day = created_at.date().isoformat()
+        subtotal = sum((price * quantity for _, _, _, quantity, price in lines), self._money(0))
+        total = subtotal + tax
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO orders (created_at, day, subtotal, tax, total) VALUES (?, ?, ?, ?, ?)",
+                (created_at.isoformat(timespec="seconds"), day, subtotal.minor, tax.minor, total.minor)
+            )
+            invoice_no = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO order_items (invoice_no, day, item_id, name, category, quantity, "
+                "unit_price, line_total) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(invoice_no, day, item_id, name, category, quantity, price.minor, (price * quantity).minor)
+                 for item_id, name, category, quantity, price in lines]
+            )
+            self._conn.executemany(
+                "INSERT INTO daily_item_sales (day, item_id, name, category, quantity, revenue) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (day, item_id) DO UPDATE SET "
+                "quantity = quantity + excluded.quantity, revenue = revenue + excluded.revenue",
+                [(day, item_id, name, category, quantity, (price * quantity).minor)
+                 for item_id, name, category, quantity, price in lines]
+            )
+        return invoice_no
+
+    def order(self, invoice_no):
+        """A stored order as a dict with its lines, or None if unknown (for reprints)"""
+        rows = self._query("SELECT created_at, subtotal, tax, total FROM orders WHERE invoice_no = ?",
+                           (invoice_no,))
+        if not rows:
+            return None
+        created_at, subtotal, tax, total = rows[0]
+        lines = self._query(
+            "SELECT item_id, name, category, quantity, unit_price FROM order_items "
+            "WHERE invoice_no = ? ORDER BY id", (invoice_no,))
+        return {'invoice_no': invoice_no, 'created_at': datetime.fromisoformat(created_at),
+                'subtotal': self._money(subtotal), 'tax': self._money(tax), 'total': self._money(total),
+                'lines': [(item_id, name, category, quantity, self._money(price))
+                          for item_id, name, category, quantity, price in lines]}
+
+    # Reports: start/end are dates, both inclusive
+    def daily_sales(self, start, end):
+        """(day, orders, subtotal, tax, total) for every day with sales"""
+        rows = self._query(
+            "SELECT day, COUNT(*), SUM(subtotal), SUM(tax), SUM(total) FROM orders "
+            "WHERE day BETWEEN ? AND ? GROUP BY day ORDER BY day",
+            (start.isoformat(), end.isoformat()))
+        return [(day, count, self._money(subtotal), self._money(tax), self._money(total))
+                for day, count, subtotal, tax, total in rows]
+
+    def category_sales(self, start, end):
+        """(category, quantity, revenue) sorted by revenue, highest first"""
+        rows = self._query(
+            "SELECT category, SUM(quantity), SUM(revenue) FROM daily_item_sales "
+            "WHERE day BETWEEN ? AND ? GROUP BY category ORDER BY SUM(revenue) DESC",
+            (start.isoformat(), end.isoformat()))
+        return [(category, quantity, self._money(revenue)) for category, quantity, revenue in rows]
+
+    def item_sales(self, start, end, limit=None):
+        """(item_id, name, quantity, revenue) sorted by revenue, highest first"""
+        rows = self._query(
+            "SELECT item_id, MAX(name), SUM(quantity), SUM(revenue) FROM daily_item_sales "
+            "WHERE day BETWEEN ? AND ? GROUP BY item_id ORDER BY SUM(revenue) DESC LIMIT ?",
+            (start.isoformat(), end.isoformat(), -1 if limit is None else limit))
+        return [(item_id, name, quantity, self._money(revenue)) for item_id, name, quantity, revenue in rows]
+
+
+def benchmark(days=365, orders_per_day=300):
+    """Fill a scratch ledger with a year of orders and time the reports"""
+    import os
+    import random
+    import tempfile
+    import time
+    from datetime import date, timedelta
+
+    random.seed(0)
+    menu = [(f"item-{i}", f"Item {i}", f"Category {i % 6}", Money(350 + 100 * i, "SGD")) for i in range(36)]
+    path = os.path.join(tempfile.mkdtemp(), "ledger.db")
+    ledger = SalesLedger(path)
+
+    began = time.perf_counter()
+    first = date.today() - timedelta(days=days - 1)
+    for offset in range(days):
+        day = datetime.combine(first + timedelta(days=offset), datetime.min.time())
+        for n in range(orders_per_day):
+            lines = [(item_id, name, category, random.randint(1, 3), price)
+                     for item_id, name, category, price in random.sample(menu, random.randint(1, 5))]
+            ledger.record_order(lines, Money(0, "SGD"), day + timedelta(seconds=n * 60))
+    print(f"recorded {days * orders_per_day} orders in {time.perf_counter() - began:.1f} s")
+
+    today = first + timedelta(days=days - 1)
+    for name, start in [("end of day", today), ("full year", first)]:
+        for report in (ledger.daily_sales, ledger.category_sales, ledger.item_sales):
+            began = time.perf_counter()
+            rows = report(start, today)
+            elapsed = time.perf_counter() - began
+            print(f"{name:>10} {report.__name__:>15}: {elapsed * 1000:8.1f} ms ({len(rows)} rows)")
+
+
+if __name__ == "__main__":
+    benchmark()
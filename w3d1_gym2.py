@@ -3,6 +3,8 @@ import pandas as pd
 import datetime
 from datetime import timedelta
 import numpy as np
+from gym_analytics import weekly_progress, format_dates
+from workout_store import WorkoutStore
 
 # Page configuration
 st.set_page_config(
@@ -76,11 +78,13 @@ def normalize_date(date_obj):
     else:
         return pd.to_datetime(date_obj)
 
-# Initialize session state for data storage
-if 'workouts' not in st.session_state:
-    st.session_state.workouts = pd.DataFrame(columns=[
-        'date', 'exercise', 'sets', 'reps', 'weight'
-    ])
+# Shared, persistent workout storage
+@st.cache_resource
+def get_store():
+    """One SQLite-backed store for all sessions and devices"""
+    return WorkoutStore()
+
+store = get_store()
 
 if 'exercises' not in st.session_state:
     st.session_state.exercises = [
@@ -134,26 +138,20 @@ if page == "Log Workout":
         submitted = st.form_submit_button("Save Workout")
         
         if submitted:
-            # Convert date to Timestamp for consistency
-            date_ts = pd.Timestamp(date)
-            new_workout = pd.DataFrame({
-                'date': [date_ts],
-                'exercise': [exercise],
-                'sets': [sets],
-                'reps': [reps],
-                'weight': [weight]
-            })
-            
-            st.session_state.workouts = pd.concat([st.session_state.workouts, new_workout], ignore_index=True)
+            new_records = store.add(date, exercise, sets, reps, weight)
             st.markdown('<div class="success-message">Workout logged successfully! 💪</div>', unsafe_allow_html=True)
             
+            # Celebrate personal records detected by the PR index
+            if new_records:
+                st.balloons()
+                st.success(f"🏆 New personal record for {exercise}: {', '.join(new_records)}!")
+            
             # Show recent workouts
-            if not st.session_state.workouts.empty:
+            recent_workouts = store.recent(3)
+            if recent_workouts:
                 st.subheader("Recent Workouts")
-                recent_workouts = st.session_state.workouts.sort_values('date', ascending=False).head(3)
-                for _, row in recent_workouts.iterrows():
-                    # Convert back to date for display
-                    display_date = row['date'].date() if hasattr(row['date'], 'date') else row['date']
+                for row in recent_workouts:
+                    display_date = row['date'].date()
                     st.markdown(f"""
                     <div class="exercise-card">
                         <strong>{row['exercise']}</strong> on {display_date}<br>
@@ -165,7 +163,7 @@ if page == "Log Workout":
 elif page == "View History":
     st.markdown('<h2 class="subheader">Workout History</h2>', unsafe_allow_html=True)
     
-    if st.session_state.workouts.empty:
+    if store.count() == 0:
         st.info("No workouts logged yet. Start logging to see your history!")
     else:
         # Filter options
@@ -178,9 +176,8 @@ elif page == "View History":
             )
         
         with col2:
-            # Get min and max dates from workouts (convert to date for the date_input)
-            min_date = st.session_state.workouts['date'].min()
-            max_date = st.session_state.workouts['date'].max()
+            # Get min and max dates from the date index (convert to date for the date_input)
+            min_date, max_date = store.date_bounds()
             
             # Convert to datetime.date for the date_input widget
             if hasattr(min_date, 'date'):
@@ -200,33 +197,19 @@ elif page == "View History":
                 max_value=datetime.date.today()
             )
         
-        # Apply filters - convert date_range to Timestamps for comparison
+        # Apply filters as an indexed query so only matching rows are loaded
         if len(date_range) == 2:
-            start_ts = pd.Timestamp(date_range[0])
-            end_ts = pd.Timestamp(date_range[1])
-            
-            filtered_data = st.session_state.workouts[
-                (st.session_state.workouts['exercise'].isin(exercise_filter)) &
-                (st.session_state.workouts['date'] >= start_ts) &
-                (st.session_state.workouts['date'] <= end_ts)
-            ]
+            filtered_data = store.query(exercise_filter, date_range[0], date_range[1]).to_frame()
         else:
-            filtered_data = st.session_state.workouts[
-                (st.session_state.workouts['exercise'].isin(exercise_filter))
-            ]
+            filtered_data = store.query(exercise_filter).to_frame()
         
         # Display data
         if not filtered_data.empty:
-            # Create a copy for display with formatted dates
-            display_data = filtered_data.copy()
-            display_data['date'] = display_data['date'].apply(
-                lambda x: x.date() if hasattr(x, 'date') else x
-            )
+            # Sort and format dates for display
+            display_data = filtered_data.sort_values('date', ascending=False)
+            display_data = display_data.assign(date=format_dates(pd.to_datetime(display_data['date'])))
             
-            st.dataframe(
-                display_data.sort_values('date', ascending=False),
-                use_container_width=True
-            )
+            st.dataframe(display_data, use_container_width=True)
             
             # Export option
             if st.button("Export Data as CSV"):
@@ -244,13 +227,11 @@ elif page == "View History":
 elif page == "Progress Dashboard":
     st.markdown('<h2 class="subheader">Progress Dashboard</h2>', unsafe_allow_html=True)
     
-    if st.session_state.workouts.empty:
+    if store.count() == 0:
         st.info("No workouts logged yet. Start logging to see your progress!")
     else:
-        # Calculate metrics
-        total_workouts = len(st.session_state.workouts)
-        total_volume = (st.session_state.workouts['sets'] * st.session_state.workouts['reps'] * st.session_state.workouts['weight']).sum()
-        favorite_exercise = st.session_state.workouts['exercise'].mode()[0] if not st.session_state.workouts.empty else "N/A"
+        # Calculate metrics (aggregated in the database)
+        total_workouts, total_volume, favorite_exercise = store.totals()
         
         # Display metrics
         col1, col2, col3 = st.columns(3)
@@ -276,37 +257,13 @@ elif page == "Progress Dashboard":
         end_date = datetime.date.today()
         start_date = end_date - timedelta(days=42)  # 6 weeks
         
-        # Convert to Timestamps for comparison
-        start_ts = pd.Timestamp(start_date)
-        end_ts = pd.Timestamp(end_date)
-        
-        weekly_data = st.session_state.workouts[
-            (st.session_state.workouts['date'] >= start_ts) &
-            (st.session_state.workouts['date'] <= end_ts)
-        ].copy()
+        # Load only the 6-week window, then aggregate it in one vectorized pass
+        workouts = store.query(start_date=start_date, end_date=end_date).to_frame()
+        weekly_data, weekly_summary, weekly_totals = weekly_progress(
+            workouts, start_date, end_date
+        )
         
         if not weekly_data.empty:
-            # Calculate week start date (Monday)
-            weekly_data['week'] = weekly_data['date'].apply(
-                lambda x: x - timedelta(days=x.weekday())
-            )
-            weekly_data['volume'] = weekly_data['sets'] * weekly_data['reps'] * weekly_data['weight']
-            
-            weekly_summary = weekly_data.groupby(['week', 'exercise']).agg({
-                'volume': 'sum',
-                'weight': 'max',
-                'sets': 'count'
-            }).reset_index()
-            
-            # Create weekly summary for all exercises combined
-            weekly_totals = weekly_data.groupby('week').agg({
-                'volume': 'sum',
-                'sets': 'count'
-            }).reset_index()
-            weekly_totals['week_label'] = weekly_totals['week'].apply(
-                lambda x: x.strftime('%Y-%m-%d')
-            )
-            
             # Weekly Volume Graph
             st.markdown("#### Weekly Training Volume")
             st.markdown('<div class="graph-container">', unsafe_allow_html=True)
@@ -337,12 +294,8 @@ elif page == "Progress Dashboard":
             )
             
             if selected_exercise:
-                exercise_data = weekly_summary[weekly_summary['exercise'] == selected_exercise].copy()
+                exercise_data = weekly_summary[weekly_summary['exercise'] == selected_exercise]
                 if not exercise_data.empty:
-                    exercise_data['week_label'] = exercise_data['week'].apply(
-                        lambda x: x.strftime('%Y-%m-%d')
-                    )
-                    
                     st.markdown(f"#### {selected_exercise} Progress")
                     st.markdown('<div class="graph-container">', unsafe_allow_html=True)
                     
@@ -351,9 +304,10 @@ elif page == "Progress Dashboard":
                     
                     with col1:
                         st.write("**Max Weight Progress**")
-                        if len(exercise_data) > 1:
-                            weight_data = exercise_data.set_index('week_label')[['weight']]
-                            st.line_chart(weight_data, use_container_width=True)
+                        records = store.pr_index.get(selected_exercise)
+                        weight_data = records.weekly_bests(start_date, end_date).set_index('week_label')
+                        if len(weight_data) > 1:
+                            st.line_chart(weight_data[['weight']], use_container_width=True)
                         else:
                             st.info("Need more data for weight trends")
                     
@@ -365,18 +319,25 @@ elif page == "Progress Dashboard":
                         else:
                             st.info("Need more data for volume trends")
                     
+                    # All-time personal records
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        st.metric("Best Weight", f"{records.max_weight[0]} lbs",
+                                  records.max_weight[1].strftime('%Y-%m-%d'), delta_color="off")
+                    with col2:
+                        st.metric("Best Set Volume", f"{records.max_volume_set[0]:,} lbs",
+                                  records.max_volume_set[1].strftime('%Y-%m-%d'), delta_color="off")
+                    with col3:
+                        st.metric("Estimated 1RM", f"{records.best_1rm[0]:.1f} lbs",
+                                  f"Brzycki: {records.best_1rm[1]:.1f} lbs", delta_color="off")
+                    
                     st.markdown('</div>', unsafe_allow_html=True)
             
             # Display weekly summary as a table
             st.markdown("#### Weekly Summary Table")
-            display_summary = weekly_summary.copy()
-            display_summary['week'] = display_summary['week'].apply(
-                lambda x: x.date() if hasattr(x, 'date') else x
-            )
-            st.dataframe(
-                display_summary.sort_values('week', ascending=False),
-                use_container_width=True
-            )
+            display_summary = weekly_summary.sort_values('week', ascending=False)
+            display_summary = display_summary.assign(week=display_summary['week_label']).drop(columns='week_label')
+            st.dataframe(display_summary, use_container_width=True)
             
             # Show progress using metrics
             st.markdown("#### Progress This Week")
@@ -1,205 +1,29 @@
 import streamlit as st
 import pandas as pd
+import os
+import tempfile
+from rate_table import RateTable, RateHistory, HISTORY_FILE
 
-# Static exchange rates as of September 16 (base: USD)
-EXCHANGE_RATES = {
-    'USD': {
-        'USD': 1.0,
-        'INR': 83.25,    # Indian Rupee
-        'EUR': 0.93,     # Euro
-        'SGD': 1.36,     # Singapore Dollar
-        'MYR': 4.68,     # Malaysian Ringgit
-        'AED': 3.67,     # UAE Dirham
-        'JPY': 147.50,   # Japanese Yen
-        'IDR': 15320.0,  # Indonesian Rupiah
-        'LKR': 325.0,    # Sri Lankan Rupee
-        'PHP': 56.80,    # Philippine Peso
-        'AUD': 1.54,     # Australian Dollar
-        'PLN': 4.25,     # Polish Złoty
-        'NPR': 132.0     # Nepalese Rupee
-    },
-    'INR': {
-        'USD': 0.012,
-        'INR': 1.0,
-        'EUR': 0.011,
-        'SGD': 0.016,
-        'MYR': 0.056,
-        'AED': 0.044,
-        'JPY': 1.77,
-        'IDR': 184.0,
-        'LKR': 3.90,
-        'PHP': 0.68,
-        'AUD': 0.0185,
-        'PLN': 0.051,
-        'NPR': 1.59
-    },
-    'EUR': {
-        'USD': 1.075,
-        'INR': 89.52,
-        'EUR': 1.0,
-        'SGD': 1.46,
-        'MYR': 5.03,
-        'AED': 3.95,
-        'JPY': 158.6,
-        'IDR': 16473.0,
-        'LKR': 349.5,
-        'PHP': 61.1,
-        'AUD': 1.66,
-        'PLN': 4.57,
-        'NPR': 142.0
-    },
-    'SGD': {
-        'USD': 0.735,
-        'INR': 61.18,
-        'EUR': 0.685,
-        'SGD': 1.0,
-        'MYR': 3.44,
-        'AED': 2.70,
-        'JPY': 108.5,
-        'IDR': 11265.0,
-        'LKR': 239.0,
-        'PHP': 41.8,
-        'AUD': 1.13,
-        'PLN': 3.12,
-        'NPR': 97.1
-    },
-    'MYR': {
-        'USD': 0.214,
-        'INR': 17.81,
-        'EUR': 0.199,
-        'SGD': 0.291,
-        'MYR': 1.0,
-        'AED': 0.785,
-        'JPY': 31.5,
-        'IDR': 3275.0,
-        'LKR': 69.5,
-        'PHP': 12.15,
-        'AUD': 0.33,
-        'PLN': 0.91,
-        'NPR': 28.2
-    },
-    'AED': {
-        'USD': 0.272,
-        'INR': 22.65,
-        'EUR': 0.253,
-        'SGD': 0.370,
-        'MYR': 1.274,
-        'AED': 1.0,
-        'JPY': 40.2,
-        'IDR': 4175.0,
-        'LKR': 88.5,
-        'PHP': 15.48,
-        'AUD': 0.42,
-        'PLN': 1.16,
-        'NPR': 36.0
-    },
-    'JPY': {
-        'USD': 0.00678,
-        'INR': 0.565,
-        'EUR': 0.0063,
-        'SGD': 0.00922,
-        'MYR': 0.0317,
-        'AED': 0.0249,
-        'JPY': 1.0,
-        'IDR': 103.9,
-        'LKR': 2.20,
-        'PHP': 0.385,
-        'AUD': 0.0104,
-        'PLN': 0.0288,
-        'NPR': 0.895
-    },
-    'IDR': {
-        'USD': 0.000065,
-        'INR': 0.00543,
-        'EUR': 0.000061,
-        'SGD': 0.000089,
-        'MYR': 0.000305,
-        'AED': 0.00024,
-        'JPY': 0.00962,
-        'IDR': 1.0,
-        'LKR': 0.0212,
-        'PHP': 0.00371,
-        'AUD': 0.0001,
-        'PLN': 0.000277,
-        'NPR': 0.00862
-    },
-    'LKR': {
-        'USD': 0.00308,
-        'INR': 0.256,
-        'EUR': 0.00286,
-        'SGD': 0.00418,
-        'MYR': 0.0144,
-        'AED': 0.0113,
-        'JPY': 0.455,
-        'IDR': 47.2,
-        'LKR': 1.0,
-        'PHP': 0.175,
-        'AUD': 0.00474,
-        'PLN': 0.0131,
-        'NPR': 0.406
-    },
-    'PHP': {
-        'USD': 0.0176,
-        'INR': 1.47,
-        'EUR': 0.0164,
-        'SGD': 0.0239,
-        'MYR': 0.0823,
-        'AED': 0.0646,
-        'JPY': 2.60,
-        'IDR': 270.0,
-        'LKR': 5.71,
-        'PHP': 1.0,
-        'AUD': 0.0271,
-        'PLN': 0.0748,
-        'NPR': 2.32
-    },
-    'AUD': {
-        'USD': 0.65,
-        'INR': 54.1,
-        'EUR': 0.602,
-        'SGD': 0.885,
-        'MYR': 3.03,
-        'AED': 2.38,
-        'JPY': 96.2,
-        'IDR': 10000.0,
-        'LKR': 211.0,
-        'PHP': 36.9,
-        'AUD': 1.0,
-        'PLN': 2.76,
-        'NPR': 85.7
-    },
-    'PLN': {
-        'USD': 0.235,
-        'INR': 19.6,
-        'EUR': 0.219,
-        'SGD': 0.321,
-        'MYR': 1.10,
-        'AED': 0.862,
-        'JPY': 34.7,
-        'IDR': 3610.0,
-        'LKR': 76.5,
-        'PHP': 13.37,
-        'AUD': 0.362,
-        'PLN': 1.0,
-        'NPR': 31.1
-    },
-    'NPR': {
-        'USD': 0.00758,
-        'INR': 0.631,
-        'EUR': 0.00704,
-        'SGD': 0.0103,
-        'MYR': 0.0354,
-        'AED': 0.0278,
-        'JPY': 1.12,
-        'IDR': 116.0,
-        'LKR': 2.46,
-        'PHP': 0.431,
-        'AUD': 0.0117,
-        'PLN': 0.0322,
-        'NPR': 1.0
-    }
+# Static exchange rates as of September 16 (units per 1 USD).
+# Every cross rate is derived from this one vector by RateTable.
+USD_RATES = {
+    'USD': 1.0,
+    'INR': 83.25,    # Indian Rupee
+    'EUR': 0.93,     # Euro
+    'SGD': 1.36,     # Singapore Dollar
+    'MYR': 4.68,     # Malaysian Ringgit
+    'AED': 3.67,     # UAE Dirham
+    'JPY': 147.50,   # Japanese Yen
+    'IDR': 15320.0,  # Indonesian Rupiah
+    'LKR': 325.0,    # Sri Lankan Rupee
+    'PHP': 56.80,    # Philippine Peso
+    'AUD': 1.54,     # Australian Dollar
+    'PLN': 4.25,     # Polish Złoty
+    'NPR': 132.0     # Nepalese Rupee
 }
 
+EXCHANGE_RATES = RateTable(USD_RATES, base='USD', as_of='September 16')
+
 # Currency symbols and full names
 CURRENCY_INFO = {
     'USD': {'symbol': '$', 'name': 'US Dollar', 'color': '#2E86AB'},
@@ -218,16 +42,95 @@ CURRENCY_INFO = {
 }
 
 def convert_currency(amount, from_currency, to_currency):
-    """Convert currency using the static exchange rates"""
+    """Convert currency using the static exchange rates.
+
+    Quotes keep full float precision (1 IDR is a fraction of a US cent);
+    exact Money rounding is for billing totals, not displayed FX rates.
+    """
     if from_currency == to_currency:
         return amount
     
     try:
-        conversion_rate = EXCHANGE_RATES[from_currency][to_currency]
-        return amount * conversion_rate
+        return EXCHANGE_RATES.convert(amount, from_currency, to_currency)
     except KeyError:
         return None
 
+def convert_many(amounts, from_codes, to_codes):
+    """Convert whole arrays of amounts at once (NaN where a currency is unknown)"""
+    return EXCHANGE_RATES.convert_many(amounts, from_codes, to_codes)
+
+def show_batch_converter():
+    """Upload a ledger CSV (amount, from, to) and download it with converted amounts"""
+    st.subheader("📄 Batch Convert a CSV Ledger")
+    st.write("Upload a CSV with **amount**, **from** and **to** columns. "
+             "It is converted in chunks and a `converted_amount` column is added.")
+    
+    uploaded = st.file_uploader("Ledger CSV", type=["csv"])
+    if uploaded is not None and st.button("Convert File"):
+        # Only the latest converted file is kept on disk
+        previous = st.session_state.pop('converted_csv', None)
+        if previous and os.path.exists(previous):
+            os.remove(previous)
+        # Stream chunk by chunk into a temporary file instead of building the result in memory
+        fd, output_path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        try:
+            with st.spinner("Converting..."):
+                rows, failed = EXCHANGE_RATES.convert_csv(uploaded, output_path)
+        except (KeyError, ValueError) as e:
+            os.remove(output_path)
+            st.error(f"Could not convert this file: {e}")
+            return
+        st.session_state.converted_csv = output_path
+        
+        st.success(f"Converted {rows:,} rows.")
+        if failed:
+            st.warning(f"{failed:,} rows had an unknown currency code and were left blank.")
+        with open(output_path, "rb") as f:
+            st.download_button(
+                label="Download Converted CSV",
+                data=f,
+                file_name=f"converted_{uploaded.name}",
+                mime="text/csv"
+            )
+
+@st.cache_resource
+def get_rate_history():
+    """Memory-mapped daily rate history, or None if it has not been recorded yet"""
+    if not os.path.exists(HISTORY_FILE + ".json"):
+        return None
+    return RateHistory(HISTORY_FILE)
+
+def show_rate_history(from_currency, to_currency, amount):
+    """Convert at a past date and chart the selected pair from the rate history"""
+    history = get_rate_history()
+    if history is None or history.end_date is None:
+        return
+    
+    st.subheader("📈 Historical Rates")
+    if from_currency not in history or to_currency not in history:
+        # The history may cover only some currencies (e.g. a scraped INR/SGD pair)
+        st.info(f"No rate history is recorded for {from_currency}/{to_currency}.")
+        return
+    past_date = st.date_input(
+        "Convert at date:",
+        value=history.end_date,
+        min_value=history.start_date,
+        max_value=history.end_date
+    )
+    try:
+        past_result = history.convert(amount, from_currency, to_currency, past_date)
+    except KeyError:
+        past_result = float("nan")
+    if past_result == past_result:  # NaN means no rates recorded for that day
+        st.write(f"On {past_date.strftime('%B %d, %Y')}: "
+                 f"{CURRENCY_INFO[from_currency]['symbol']} {amount:,.2f} {from_currency} = "
+                 f"{CURRENCY_INFO[to_currency]['symbol']} {past_result:,.2f} {to_currency}")
+    else:
+        st.info(f"No rates recorded for {from_currency}/{to_currency} on that date.")
+    
+    st.line_chart(history.series(from_currency, to_currency).dropna())
+
 def main():
     st.set_page_config(
         page_title="Global Currency Converter",
@@ -298,7 +201,7 @@ def main():
         # From currency selection with colored box
         from_currency = st.selectbox(
             "From Currency:",
-            options=list(EXCHANGE_RATES.keys()),
+            options=EXCHANGE_RATES.codes,
             index=0,  # Default to USD
             format_func=lambda x: f"{CURRENCY_INFO[x]['symbol']} {x} - {CURRENCY_INFO[x]['name']}"
         )
@@ -317,7 +220,7 @@ def main():
         # To currency selection with colored box
         to_currency = st.selectbox(
             "To Currency:",
-            options=list(EXCHANGE_RATES.keys()),
+            options=EXCHANGE_RATES.codes,
             index=1,  # Default to INR
             format_func=lambda x: f"{CURRENCY_INFO[x]['symbol']} {x} - {CURRENCY_INFO[x]['name']}"
         )
@@ -364,12 +267,19 @@ def main():
                     <h2 style="color: {from_color};">{CURRENCY_INFO[from_currency]['symbol']} {amount:,.2f} {from_currency}</h2>
                     <h1 style="margin: 10px 0;">⬇️</h1>
                     <h2 style="color: {to_color};">{CURRENCY_INFO[to_currency]['symbol']} {result_str} {to_currency}</h2>
-                    <p>Exchange rate: 1 {from_currency} = {EXCHANGE_RATES[from_currency][to_currency]:,.6f} {to_currency}</p>
+                    <p>Exchange rate: 1 {from_currency} = {EXCHANGE_RATES.rate(from_currency, to_currency):,.6f} {to_currency}</p>
                 </div>
                 """, unsafe_allow_html=True)
             else:
                 st.error("Conversion failed. Please try again.")
     
+    # Conversion at past dates, when a rate history has been recorded
+    show_rate_history(from_currency, to_currency, amount)
+    
+    # Batch conversion of uploaded ledgers
+    st.markdown("---")
+    show_batch_converter()
+    
     # Currency information section
     st.markdown("---")
     st.subheader("💰 Supported Currencies")
@@ -381,7 +291,7 @@ def main():
         <div class="currency-card" style="border-color: {info['color']}">
             <h4 style="color: {info['color']}; margin: 0;">{info['symbol']} {code}</h4>
             <p style="margin: 5px 0; font-size: 0.9rem;">{info['name']}</p>
-            <p style="margin: 0; font-size: 0.8rem; color: #666;">1 USD = {EXCHANGE_RATES['USD'][code]:.2f} {code}</p>
+            <p style="margin: 0; font-size: 0.8rem; color: #666;">1 USD = {EXCHANGE_RATES.rate('USD', code):.2f} {code}</p>
         </div>
         """, unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
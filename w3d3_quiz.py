@@ -1,5 +1,8 @@
+import os
+
 import streamlit as st
-import random
+
+from question_bank import QuestionBank
 
 # Custom CSS for UX/colors
 st.markdown("""
@@ -60,6 +63,26 @@ ALL_QUESTIONS = [
 
 NUM_QUESTIONS_PER_QUIZ = 10
 
+# Optional question banks; when present they replace the built-in questions
+QUESTIONS_DB = "questions.db"
+QUESTIONS_JSON = "questions.json"
+
+
+@st.cache_resource
+def get_question_bank():
+    """Load and index the question bank once per server process"""
+    if os.path.exists(QUESTIONS_DB):
+        return QuestionBank.from_sqlite(QUESTIONS_DB)
+    if os.path.exists(QUESTIONS_JSON):
+        return QuestionBank.from_json(QUESTIONS_JSON)
+    return QuestionBank.from_list(ALL_QUESTIONS)
+
+
+def new_quiz():
+    bank = get_question_bank()
+    return bank.sample(min(NUM_QUESTIONS_PER_QUIZ, len(bank)))
+
+
 # Initialize session state
 if "score" not in st.session_state:
     st.session_state.score = 0
@@ -69,12 +92,13 @@ if "show_score" not in st.session_state:
     st.session_state.show_score = False
 if "selected_questions" not in st.session_state:
     # Randomly pick 10 questions on start/new session
-    st.session_state.selected_questions = random.sample(ALL_QUESTIONS, NUM_QUESTIONS_PER_QUIZ)
+    st.session_state.selected_questions = new_quiz()
 
 
 def show_question():
+    total = len(st.session_state.selected_questions)
     qn = st.session_state.selected_questions[st.session_state.current_index]
-    st.subheader(f"Question {st.session_state.current_index + 1} of {NUM_QUESTIONS_PER_QUIZ}")
+    st.subheader(f"Question {st.session_state.current_index + 1} of {total}")
     st.write(qn["question"])
 
     selected = st.radio(
@@ -89,7 +113,7 @@ def show_question():
         else:
             st.error(f"Wrong! The correct answer was: {qn['answer']}")
 
-        if st.session_state.current_index + 1 < NUM_QUESTIONS_PER_QUIZ:
+        if st.session_state.current_index + 1 < total:
             st.session_state.current_index += 1
             st.rerun()
         else:
@@ -100,15 +124,16 @@ def show_question():
 def show_final_score():
     st.markdown("<hr>", unsafe_allow_html=True)
     st.subheader("Quiz Completed! 🏆")
-    st.write(f"Your final score is: {st.session_state.score} out of {NUM_QUESTIONS_PER_QUIZ}")
-    if st.session_state.score == NUM_QUESTIONS_PER_QUIZ:
+    total = len(st.session_state.selected_questions)
+    st.write(f"Your final score is: {st.session_state.score} out of {total}")
+    if st.session_state.score == total:
         st.balloons()
         st.success("🎉 Congratulations on a perfect score! 🎉")
     if st.button("Restart Quiz"):
         st.session_state.score = 0
         st.session_state.current_index = 0
         st.session_state.show_score = False
-        st.session_state.selected_questions = random.sample(ALL_QUESTIONS, NUM_QUESTIONS_PER_QUIZ)
+        st.session_state.selected_questions = new_quiz()
         st.rerun()
 
 
@@ -1,8 +1,11 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-import csv
 import os
+import tempfile
+from registration_store import (CSV_FILE, EXPORT_FORMATS, CONFIRMED, WAITLISTED, DUPLICATE,
+                                RegistrationWriter, RegistrationStats, RegistrationIndex,
+                                export_registrations)
 
 # Page configuration
 st.set_page_config(
@@ -71,15 +74,27 @@ st.markdown('<h2 class="sub-header">College Cultural Program</h2>', unsafe_allow
 st.write("**Venue:** PSG College, Cauvery Auditorium")
 st.write("**Date:** September 21, 2025")
 
-# Initialize session state for registration count and form
-if 'registration_count' not in st.session_state:
-    # Load existing count from CSV if available
-    if os.path.exists("registrations.csv"):
-        df = pd.read_csv("registrations.csv")
-        st.session_state.registration_count = len(df)
-    else:
-        st.session_state.registration_count = 0
-        
+# One writer thread per server process, shared by every session
+@st.cache_resource
+def get_writer():
+    return RegistrationWriter(CSV_FILE)
+
+# Counters that only parse newly appended rows, shared by every session
+@st.cache_resource
+def get_stats():
+    return RegistrationStats(CSV_FILE)
+
+stats = get_stats().refresh()
+
+# (phone, event) uniqueness index and seat counters, rebuilt from the CSV when the server starts
+@st.cache_resource
+def get_index():
+    index = RegistrationIndex(csv_path=CSV_FILE)
+    for event, capacity in EVENT_CAPACITY.items():
+        index.set_capacity(event, capacity)
+    return index
+
+# Initialize session state for the form
 if 'form_submitted' not in st.session_state:
     st.session_state.form_submitted = False
 if 'last_registration' not in st.session_state:
@@ -87,20 +102,11 @@ if 'last_registration' not in st.session_state:
 if 'selected_option' not in st.session_state:
     st.session_state.selected_option = "Student Registration"
 
-# Define events
+# Define events and the seats available in each
 events = ["Dance", "Singing", "Mono acting", "Standup comedy"]
+EVENT_CAPACITY = {"Dance": 100, "Singing": 100, "Mono acting": 100, "Standup comedy": 100}
 
-# CSV file path
-CSV_FILE = "registrations.csv"
-
-# Function to load existing registrations
-def load_registrations():
-    if os.path.exists(CSV_FILE):
-        return pd.read_csv(CSV_FILE)
-    else:
-        return pd.DataFrame(columns=["Name", "Major", "Phone", "Event", "Timestamp"])
-
-# Function to save registration
+# Function to save registration; returns CONFIRMED, WAITLISTED or DUPLICATE
 def save_registration(name, major, phone, event):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     new_data = {
@@ -111,20 +117,47 @@ def save_registration(name, major, phone, event):
         "Timestamp": timestamp
     }
     
-    # Write to CSV file
-    with open(CSV_FILE, 'a', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=new_data.keys())
-        if f.tell() == 0:  # Check if file is empty to write header
-            writer.writeheader()
-        writer.writerow(new_data)
+    # Take a seat (or a waitlist place) atomically before anything is written
+    index = get_index()
+    status, position = index.reserve(new_data)
+    if status == DUPLICATE:
+        return status
     
-    # Update registration count and last registration
-    st.session_state.registration_count += 1
+    # Queue confirmed rows for the shared writer and wait until they are on disk
+    if status == CONFIRMED:
+        append_confirmed(index, new_data)
+    
+    # Update last registration
     st.session_state.last_registration = {
         "name": name,
-        "event": event
+        "event": event,
+        "waitlist_position": position
     }
     st.session_state.form_submitted = True
+    return status
+
+def append_confirmed(index, row):
+    """Write a confirmed row to the CSV; if that fails, its seat goes to the next student
+    on the waitlist, who is written instead, and the original error is raised"""
+    error = None
+    while row is not None:
+        try:
+            get_writer().append(row)
+            row = None
+        except Exception as e:
+            error = error or e
+            row = index.release(row["Phone"], row["Event"])
+    if error is not None:
+        raise error
+
+def event_label(event):
+    """Selectbox label with the seats left, e.g. "Dance (12 seats left)" """
+    taken, capacity, _ = get_index().seats().get(event, (0, None, 0))
+    if capacity is None:
+        return event
+    if taken >= capacity:
+        return f"{event} (full - join the waitlist)"
+    return f"{event} ({capacity - taken} seats left)"
 
 # Navigation options
 option = st.radio(
@@ -142,13 +175,18 @@ if option == "Student Registration":
     if st.session_state.form_submitted:
         name = st.session_state.last_registration["name"]
         event = st.session_state.last_registration["event"]
-        st.markdown(f"""
-        <div class="success-box">
-            <h3>Thank you, {name}!</h3>
-            <p>You have successfully registered for <strong>{event}</strong>.</p>
-            <p>We look forward to seeing you at the event!</p>
-        </div>
-        """, unsafe_allow_html=True)
+        position = st.session_state.last_registration.get("waitlist_position")
+        if position is None:
+            st.markdown(f"""
+            <div class="success-box">
+                <h3>Thank you, {name}!</h3>
+                <p>You have successfully registered for <strong>{event}</strong>.</p>
+                <p>We look forward to seeing you at the event!</p>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.warning(f"Thank you, {name}! **{event}** is full, so you are number {position} "
+                       f"on its waitlist. We will contact you if a seat opens up.")
 
     # Registration form
     with st.form("registration_form", clear_on_submit=True):
@@ -160,7 +198,7 @@ if option == "Student Registration":
         
         with col2:
             phone = st.text_input("Phone Number*", placeholder="10-digit phone number")
-            event = st.selectbox("Choose Event*", events, index=0)
+            event = st.selectbox("Choose Event*", events, index=0, format_func=event_label)
         
         submitted = st.form_submit_button("Register Now")
         
@@ -169,78 +207,167 @@ if option == "Student Registration":
                 st.error("Please fill all required fields (*)")
             elif len(phone) < 10 or not phone.isdigit():
                 st.error("Please enter a valid 10-digit phone number")
+            elif save_registration(name, major, phone, event) == DUPLICATE:
+                st.error(f"{phone} is already registered for {event}")
             else:
-                save_registration(name, major, phone, event)
                 st.rerun()
 
     # Display live registration count
     st.markdown("---")
     st.markdown('<div class="registration-count">', unsafe_allow_html=True)
-    st.metric("Total Registrations", st.session_state.registration_count)
+    st.metric("Total Registrations", stats.total)
     st.markdown('</div>', unsafe_allow_html=True)
 
     # Show event-wise breakdown if we have registrations
-    if st.session_state.registration_count > 0:
-        df = load_registrations()
-        if not df.empty:
-            event_counts = df['Event'].value_counts()
-            st.write("**Registrations by Event:**")
-            col1, col2, col3, col4 = st.columns(4)
-            cols = [col1, col2, col3, col4]
-            
-            for i, (event_name, count) in enumerate(event_counts.items()):
-                with cols[i % 4]:
-                    st.metric(event_name, count)
+    if stats.total > 0:
+        st.write("**Registrations by Event:**")
+        col1, col2, col3, col4 = st.columns(4)
+        cols = [col1, col2, col3, col4]
+        
+        for i, (event_name, count) in enumerate(stats.by_event()):
+            with cols[i % 4]:
+                st.metric(event_name, count)
 
 # Admin Panel Section
 elif option == "Admin Panel":
     st.markdown('<div class="section-header"><h3>🔧 Admin Panel</h3></div>', unsafe_allow_html=True)
     st.write("Organizer tools for managing registrations")
 
-    if os.path.exists(CSV_FILE):
-        df = load_registrations()
-        if not df.empty:
-            # Display metrics
-            st.subheader("Registration Statistics")
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.metric("Total Registrations", len(df))
-            
-            with col2:
-                st.metric("Unique Events", df['Event'].nunique())
-            
-            with col3:
-                latest_reg = df['Timestamp'].max()
-                if isinstance(latest_reg, str):
-                    st.metric("Latest Registration", latest_reg.split()[0])
-                else:
-                    st.metric("Latest Registration", "N/A")
-            
-            # Event distribution chart
-            st.subheader("Event Distribution")
-            event_counts = df['Event'].value_counts()
-            st.bar_chart(event_counts)
-            
-            # Data export
-            st.subheader("Data Export")
-            csv_data = df.to_csv(index=False).encode('utf-8')
+    if stats.total > 0:
+        # Display metrics
+        st.subheader("Registration Statistics")
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Total Registrations", stats.total)
+        
+        with col2:
+            st.metric("Unique Events", len(stats.event_counts))
+        
+        with col3:
+            if stats.latest:
+                st.metric("Latest Registration", stats.latest.split()[0])
+            else:
+                st.metric("Latest Registration", "N/A")
+        
+        # Seats taken and waitlist length per event
+        st.subheader("Seats")
+        seats = get_index().seats()
+        cols = st.columns(len(events))
+        for col, event_name in zip(cols, events):
+            taken, capacity, waiting = seats.get(event_name, (0, None, 0))
+            with col:
+                st.metric(event_name, f"{taken}/{capacity or '∞'}",
+                          f"{waiting} waitlisted" if waiting else None, delta_color="off")
+        
+        # Waitlisted students, in queue order, so organizers can contact them
+        waiting_events = [event_name for event_name in events if seats.get(event_name, (0, None, 0))[2]]
+        if waiting_events:
+            st.subheader("Waitlist")
+            waitlist_event = st.selectbox("Event waitlist", waiting_events)
+            waitlist_df = pd.DataFrame(get_index().waitlist(waitlist_event))
+            waitlist_df.index = pd.RangeIndex(1, len(waitlist_df) + 1, name="Position")
+            st.dataframe(waitlist_df)
+            st.caption("The waitlist is stored only in registrations.db, not in registrations.csv. "
+                       "Keep that file, or download the waitlist, before resetting the registrations.")
             st.download_button(
-                label="Download Full CSV",
-                data=csv_data,
-                file_name="heart_beat_registrations.csv",
-                mime="text/csv",
-                help="Download all registration data as a CSV file"
+                label=f"Download {waitlist_event} Waitlist",
+                data=waitlist_df.to_csv().encode("utf-8"),
+                file_name=f"heart_beat_waitlist_{waitlist_event.lower().replace(' ', '_')}.csv",
+                mime="text/csv"
             )
-            
-            # Show data preview
-            st.subheader("Registration Data Preview")
-            st.dataframe(df)
-            
-            # Show raw data
-            with st.expander("View Raw Data"):
-                st.write(df)
+        
+        # Event distribution chart
+        st.subheader("Event Distribution")
+        event_counts = pd.Series(dict(stats.by_event()), name="count")
+        st.bar_chart(event_counts)
+        
+        # Data export: the file is only built when asked for, chunk by chunk on disk
+        st.subheader("Data Export")
+        col1, col2 = st.columns(2)
+        with col1:
+            export_format = st.selectbox("Format", list(EXPORT_FORMATS))
+        extension, mime = EXPORT_FORMATS[export_format]
+        with col2:
+            st.write("")
+            prepare = st.button(f"Prepare {export_format} Export")
+        if prepare:
+            previous = st.session_state.pop('export', None)
+            if previous and os.path.exists(previous[0]):
+                os.remove(previous[0])
+            fd, export_path = tempfile.mkstemp(suffix=extension)
+            os.close(fd)
+            try:
+                with st.spinner("Building export..."):
+                    export_registrations(get_index(), export_format, export_path)
+                st.session_state.export = (export_path, export_format)
+            except ImportError as e:
+                os.remove(export_path)
+                st.error(f"{export_format} export needs an extra package: {e.name}")
+        
+        if st.session_state.get('export', (None, None))[1] == export_format:
+            with open(st.session_state.export[0], 'rb') as f:
+                st.download_button(
+                    label=f"Download {export_format}",
+                    data=f,
+                    file_name=f"heart_beat_registrations{extension}",
+                    mime=mime,
+                    help="Download all registration data"
+                )
+        
+        # Browse registrations one page at a time; filtering and sorting run in SQLite
+        st.subheader("Registration Data")
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            event_filter = st.selectbox("Event", ["All"] + events)
+        with col2:
+            name_filter = st.text_input("Name contains")
+        with col3:
+            major_filter = st.text_input("Major contains")
+        with col4:
+            phone_filter = st.text_input("Phone starts with")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            sort_by = st.selectbox("Sort by", ["Timestamp", "Name", "Major", "Phone", "Event"])
+        with col2:
+            page_size = st.selectbox("Rows per page", [25, 50, 100], index=1)
+        with col3:
+            descending = st.checkbox("Descending", value=True)
+        
+        filters = {
+            "Event": "" if event_filter == "All" else event_filter,
+            "Name": name_filter.strip(),
+            "Major": major_filter.strip(),
+            "Phone": phone_filter.strip()
+        }
+        
+        # Keyset pagination: remember the key each visited page starts after
+        query = (tuple(filters.items()), sort_by, descending, page_size)
+        if st.session_state.get('admin_query') != query:
+            st.session_state.admin_query = query
+            st.session_state.admin_page_keys = [None]
+        page_keys = st.session_state.admin_page_keys
+        
+        index = get_index()
+        matches = index.count(filters)
+        page_df, next_key = index.page(filters, sort_by, descending, page_size, after=page_keys[-1])
+        
+        first_row = (len(page_keys) - 1) * page_size
+        if matches:
+            st.caption(f"Showing {first_row + 1}-{first_row + len(page_df)} of {matches} registrations")
         else:
-            st.info("No registrations yet.")
+            st.caption("No registrations match these filters")
+        st.dataframe(page_df)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("◀ Previous", disabled=len(page_keys) == 1):
+                page_keys.pop()
+                st.rerun()
+        with col2:
+            if st.button("Next ▶", disabled=next_key is None):
+                page_keys.append(next_key)
+                st.rerun()
     else:
         st.info("No registrations yet.")
\ No newline at end of file
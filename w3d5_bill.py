@@ -1,12 +1,10 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from datetime import datetime
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-import os
+from datetime import date
+from billing_engine import BillingEngine, load_menu
+from invoice_renderer import InvoiceRenderer
+from receipt_printer import ReceiptRenderer, RECEIPT_PRINTER
+from sales_ledger import SalesLedger
 
 class RestaurantBillingApp:
     def __init__(self, root):
@@ -36,59 +34,14 @@ class RestaurantBillingApp:
             "tree_even_row": "#eeeeee"
         }
         
-        # Menu items with prices in SGD
-        self.menu_items = {
-            "Starters": {
-                "Samosa (2 pcs)": 5.90,
-                "Paneer Tikka": 8.90,
-                "Chicken 65": 9.90,
-                "Vegetable Pakora": 6.50,
-                "Aloo Tikki": 5.50
-            },
-            "Main Course - Vegetarian": {
-                "Paneer Butter Masala": 15.90,
-                "Palak Paneer": 14.90,
-                "Chana Masala": 12.90,
-                "Dal Makhani": 13.50,
-                "Mixed Vegetable Curry": 12.50,
-                "Malai Kofta": 16.50
-            },
-            "Main Course - Non-Vegetarian": {
-                "Butter Chicken": 18.90,
-                "Chicken Tikka Masala": 17.90,
-                "Lamb Rogan Josh": 21.90,
-                "Fish Curry": 19.50,
-                "Chicken Biryani": 16.90,
-                "Mutton Biryani": 22.50
-            },
-            "Breads & Rice": {
-                "Garlic Naan": 4.50,
-                "Butter Naan": 3.90,
-                "Tandoori Roti": 3.50,
-                "Plain Rice": 4.50,
-                "Jeera Rice": 5.50,
-                "Kashmiri Pulao": 8.90
-            },
-            "Desserts": {
-                "Gulab Jamun (2 pcs)": 6.50,
-                "Rasmalai": 7.50,
-                "Kheer": 5.90,
-                "Mango Lassi": 5.50,
-                "Masala Chai": 3.50
-            },
-            "Beverages": {
-                "Mango Lassi": 5.50,
-                "Sweet Lassi": 4.50,
-                "Salted Lassi": 4.50,
-                "Masala Chai": 3.50,
-                "Fresh Lime Juice": 4.50,
-                "Mineral Water": 2.50
-            }
-        }
-        
-        self.current_order = {}
-        self.tax_rate = 0.09  # 9% GST for Singapore
+        # Orders, pricing, tax and the sales ledger live in the headless engine
         self.currency = "SGD"
+        self.engine = BillingEngine(load_menu(self.currency), ledger=SalesLedger(currency=self.currency))
+        self.menu = self.engine.menu
+        self.ledger = self.engine.ledger
+        self.order_id = self.engine.open_order()
+        self.renderer = InvoiceRenderer(self.colors)  # Styles and header/footer built once
+        self.receipts = ReceiptRenderer(escpos=RECEIPT_PRINTER is not None)  # Raw codes only for a real printer
         
         self.setup_ui()
         
@@ -153,15 +106,28 @@ class RestaurantBillingApp:
         menu_frame = ttk.LabelFrame(main_frame, text="Menu", padding="10")
         menu_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10), pady=5)
         menu_frame.columnconfigure(0, weight=1)
-        menu_frame.rowconfigure(0, weight=1)
+        menu_frame.rowconfigure(1, weight=1)
+        
+        # Quick search over the catalog's name index
+        search_frame = ttk.Frame(menu_frame)
+        search_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        search_frame.columnconfigure(1, weight=1)
+        
+        ttk.Label(search_frame, text="Search:", font=("Arial", 10)).grid(row=0, column=0, sticky=tk.W)
+        self.search_var = tk.StringVar()
+        self.search_results = {}
+        self.search_box = ttk.Combobox(search_frame, textvariable=self.search_var)
+        self.search_box.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(5, 0))
+        self.search_box.bind("<KeyRelease>", self.update_search_results)
+        self.search_box.bind("<<ComboboxSelected>>", self.select_search_result)
         
         # Create notebook for menu categories
         notebook = ttk.Notebook(menu_frame)
-        notebook.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        notebook.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Create frames for each category
         self.category_frames = {}
-        for category in self.menu_items:
+        for category in self.menu.categories:
             frame = ttk.Frame(notebook, padding="10")
             notebook.add(frame, text=category)
             self.category_frames[category] = frame
@@ -219,6 +185,10 @@ class RestaurantBillingApp:
         self.order_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         
+        # Alternating row colors
+        self.order_tree.tag_configure('odd', background=self.colors["tree_odd_row"])
+        self.order_tree.tag_configure('even', background=self.colors["tree_even_row"])
+        
         # Bill summary
         bill_frame = ttk.Frame(order_frame, style="TFrame")
         bill_frame.grid(row=3, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
@@ -246,11 +216,15 @@ class RestaurantBillingApp:
                   style="Action.TButton", width=15).grid(row=0, column=1, padx=5, pady=5)
         ttk.Button(button_frame, text="Clear Order", command=self.clear_order, 
                   style="Action.TButton", width=15).grid(row=0, column=2, padx=5, pady=5)
+        ttk.Button(button_frame, text="Print Receipt", command=self.print_receipt, 
+                  style="Action.TButton", width=15).grid(row=0, column=3, padx=5, pady=5)
         ttk.Button(button_frame, text="Generate PDF Invoice", command=self.generate_pdf, 
-                  style="Action.TButton", width=18).grid(row=0, column=3, padx=5, pady=5)
+                  style="Action.TButton", width=18).grid(row=0, column=4, padx=5, pady=5)
+        ttk.Button(button_frame, text="End of Day Report", command=self.show_day_report, 
+                  style="Action.TButton", width=18).grid(row=0, column=5, padx=5, pady=5)
         
         # Configure weights for resizing
-        menu_frame.rowconfigure(0, weight=1)
+        menu_frame.rowconfigure(1, weight=1)
         menu_frame.columnconfigure(0, weight=1)
         order_frame.rowconfigure(2, weight=1)
         order_frame.columnconfigure(0, weight=1)
@@ -260,12 +234,12 @@ class RestaurantBillingApp:
         col = 0
         max_cols = 2  # Number of columns for menu items
         
-        for item, price in self.menu_items[category].items():
+        for item_id, name, price in self.menu.category_items(category):
             # Use ttk buttons for better styling consistency
             btn = ttk.Button(frame, 
-                           text=f"{item}\n{self.currency} {price:.2f}", 
+                           text=f"{name}\n{self.currency} {price:.2f}", 
                            style="Menu.TButton",
-                           command=lambda i=item, p=price: self.select_item(i, p))
+                           command=lambda i=item_id: self.select_item(i))
             btn.grid(row=row, column=col, sticky=(tk.W, tk.E, tk.N, tk.S), padx=5, pady=3)
             
             col += 1
@@ -273,10 +247,19 @@ class RestaurantBillingApp:
                 col = 0
                 row += 1
     
-    def select_item(self, item, price):
-        self.selected_item = item
-        self.selected_price = price
-        self.selected_item_var.set(f"{item} - {self.currency} {price:.2f}")
+    def select_item(self, item_id):
+        self.selected_item = item_id
+        self.selected_item_var.set(f"{self.menu.name(item_id)} - {self.currency} {self.menu.price(item_id):.2f}")
+    
+    def update_search_results(self, event=None):
+        matches = self.menu.search(self.search_var.get())
+        self.search_results = {self.menu.name(item_id): item_id for item_id in matches}
+        self.search_box["values"] = list(self.search_results)
+    
+    def select_search_result(self, event=None):
+        item_id = self.search_results.get(self.search_var.get())
+        if item_id is not None:
+            self.select_item(item_id)
         
     def add_to_order(self):
         if not hasattr(self, 'selected_item'):
@@ -292,15 +275,10 @@ class RestaurantBillingApp:
             messagebox.showwarning("Warning", "Please enter a valid quantity!")
             return
         
-        if self.selected_item in self.current_order:
-            self.current_order[self.selected_item]['quantity'] += quantity
-        else:
-            self.current_order[self.selected_item] = {
-                'price': self.selected_price,
-                'quantity': quantity
-            }
-        
-        self.update_order_display()
+        if self.engine.order(self.order_id).recorded is not None:
+            self.new_order()  # The last bill is settled; start the next customer's order
+        self.engine.add_item(self.order_id, self.selected_item, quantity)
+        self.update_order_row(self.selected_item)
     
     def remove_from_order(self):
         selected_item = self.order_tree.selection()
@@ -308,47 +286,78 @@ class RestaurantBillingApp:
             messagebox.showwarning("Warning", "Please select an item to remove!")
             return
         
-        item = self.order_tree.item(selected_item[0])['values'][0]
-        if item in self.current_order:
-            del self.current_order[item]
-            self.update_order_display()
+        if self.engine.order(self.order_id).recorded is not None:
+            messagebox.showwarning("Warning", "This order has already been billed and cannot be changed!")
+            return
+        
+        item = selected_item[0]  # Row IDs are the order's item IDs
+        if self.engine.remove_item(self.order_id, item):
+            self.update_order_row(item)
     
     def clear_order(self):
         if messagebox.askyesno("Confirm", "Are you sure you want to clear the entire order?"):
-            self.current_order = {}
-            self.update_order_display()
+            if self.engine.order(self.order_id).recorded is not None:
+                self.new_order()
+                return
+            self.engine.clear_order(self.order_id)
+            self.order_tree.delete(*self.order_tree.get_children())
+            self.update_bill_summary()
     
-    def update_order_display(self):
-        # Clear current display
-        for item in self.order_tree.get_children():
-            self.order_tree.delete(item)
-        
-        # Add items to display with alternating row colors
-        for i, (item, details) in enumerate(self.current_order.items()):
+    def new_order(self):
+        """Close the billed order and start an empty one for the next customer"""
+        self.engine.close_order(self.order_id)
+        self.order_id = self.engine.open_order()
+        self.order_tree.delete(*self.order_tree.get_children())
+        self.update_bill_summary()
+    
+    def update_order_row(self, item):
+        """Insert, update or delete the single Treeview row for one order line"""
+        items = self.engine.order(self.order_id).items
+        details = items.get(item)
+        if details is None:
+            if self.order_tree.exists(item):
+                index = self.order_tree.index(item)
+                self.order_tree.delete(item)
+                # Rows below the deleted one shift up, so swap their stripe color
+                for i, row in enumerate(self.order_tree.get_children()[index:], index):
+                    self.order_tree.item(row, tags=('even',) if i % 2 == 0 else ('odd',))
+        else:
             total = details['price'] * details['quantity']
-            tags = ('even',) if i % 2 == 0 else ('odd',)
-            self.order_tree.insert("", "end", values=(
-                item, details['quantity'], f"{self.currency} {details['price']:.2f}", f"{self.currency} {total:.2f}"
-            ), tags=tags)
-        
-        # Configure tag colors
-        self.order_tree.tag_configure('odd', background=self.colors["tree_odd_row"])
-        self.order_tree.tag_configure('even', background=self.colors["tree_even_row"])
+            values = (self.menu.name(item), details['quantity'],
+                      f"{self.currency} {details['price']:.2f}", f"{self.currency} {total:.2f}")
+            if self.order_tree.exists(item):
+                self.order_tree.item(item, values=values)
+            else:
+                # New lines are appended, so their position is the order size
+                i = len(items) - 1
+                self.order_tree.insert("", "end", iid=item, values=values,
+                                       tags=('even',) if i % 2 == 0 else ('odd',))
         
         # Update bill summary
         self.update_bill_summary()
     
     def update_bill_summary(self):
-        subtotal = sum(details['price'] * details['quantity'] for details in self.current_order.values())
-        tax = subtotal * self.tax_rate
-        total = subtotal + tax
+        subtotal, tax, total = self.engine.totals(self.order_id)
         
         self.subtotal_var.set(f"{self.currency} {subtotal:.2f}")
         self.tax_var.set(f"{self.currency} {tax:.2f}")
         self.total_var.set(f"{self.currency} {total:.2f}")
     
+    def print_receipt(self):
+        """Stream a text/ESC-POS receipt to the counter printer (or receipts.txt)"""
+        if not self.engine.order(self.order_id).items:
+            messagebox.showwarning("Warning", "No items in the order to print a receipt!")
+            return
+        
+        invoice = self.engine.checkout(self.order_id)
+        try:
+            target = self.receipts.print_receipt(invoice)
+            messagebox.showinfo("Success", f"Receipt {invoice['number']} sent to: {target}")
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to print receipt: {str(e)}")
+    
     def generate_pdf(self):
-        if not self.current_order:
+        if not self.engine.order(self.order_id).items:
             messagebox.showwarning("Warning", "No items in the order to generate invoice!")
             return
         
@@ -362,134 +371,44 @@ class RestaurantBillingApp:
         if not file_path:
             return
         
+        # Checkout records the sale once (re-saving an unchanged order reprints
+        # the same invoice); the PDF is then built in the background
+        invoice = self.engine.checkout(self.order_id)
+        future = self.renderer.render_async(invoice, file_path)
+        self.root.after(100, self.check_pdf, future)
+    
+    def check_pdf(self, future):
+        """Poll a background render from the Tk event loop and report the result"""
+        if not future.done():
+            self.root.after(100, self.check_pdf, future)
+            return
         try:
-            # Create PDF with better formatting
-            doc = SimpleDocTemplate(file_path, pagesize=letter)
-            elements = []
-            styles = getSampleStyleSheet()
-            
-            # Add title
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=20,
-                spaceAfter=30,
-                alignment=1,  # Center aligned
-                textColor=colors.HexColor(self.colors["primary"])
-            )
-            title = Paragraph("SPICE GARDEN", title_style)
-            elements.append(title)
-            
-            # Add subtitle
-            subtitle_style = ParagraphStyle(
-                'CustomSubtitle',
-                parent=styles['Heading2'],
-                fontSize=14,
-                spaceAfter=20,
-                alignment=1,
-                textColor=colors.HexColor(self.colors["secondary"])
-            )
-            subtitle = Paragraph("Authentic Indian Cuisine", subtitle_style)
-            elements.append(subtitle)
-            
-            # Add restaurant info
-            info_style = ParagraphStyle(
-                'InfoStyle',
-                parent=styles['Normal'],
-                fontSize=10,
-                spaceAfter=20,
-                alignment=1
-            )
-            info_text = "123 Little India Road, Singapore 123456<br/>Tel: +65 6123 4567 | Email: info@spicegarden.sg"
-            info = Paragraph(info_text, info_style)
-            elements.append(info)
-            
-            # Add invoice title
-            invoice_title_style = ParagraphStyle(
-                'InvoiceTitle',
-                parent=styles['Heading2'],
-                fontSize=16,
-                spaceAfter=20,
-                alignment=0,  # Left aligned
-                textColor=colors.HexColor(self.colors["primary"])
-            )
-            invoice_title = Paragraph("INVOICE", invoice_title_style)
-            elements.append(invoice_title)
-            
-            # Add invoice details
-            details_style = ParagraphStyle(
-                'DetailsStyle',
-                parent=styles['Normal'],
-                fontSize=10,
-                spaceAfter=30
-            )
-            details_text = f"Date: {datetime.now().strftime('%d-%m-%Y %H:%M:%S')}<br/>Invoice #: SG{datetime.now().strftime('%Y%m%d%H%M%S')}"
-            details = Paragraph(details_text, details_style)
-            elements.append(details)
-            
-            # Create table data
-            table_data = [['Item', 'Qty', 'Price', 'Total']]
-            
-            subtotal = 0
-            for item, details in self.current_order.items():
-                item_total = details['price'] * details['quantity']
-                subtotal += item_total
-                table_data.append([
-                    item,
-                    str(details['quantity']),
-                    f"{self.currency} {details['price']:.2f}",
-                    f"{self.currency} {item_total:.2f}"
-                ])
-            
-            tax = subtotal * self.tax_rate
-            total = subtotal + tax
-            
-            # Add summary rows
-            table_data.append(['', '', 'Subtotal:', f"{self.currency} {subtotal:.2f}"])
-            table_data.append(['', '', 'GST (9%):', f"{self.currency} {tax:.2f}"])
-            table_data.append(['', '', 'Total:', f"{self.currency} {total:.2f}"])
-            
-            # Create table
-            table = Table(table_data, colWidths=[280, 60, 80, 80])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(self.colors["tree_header_bg"])),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (1, -1), 'CENTER'),
-                ('ALIGN', (2, 0), (-1, -1), 'RIGHT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -4), colors.white),
-                ('FONTNAME', (0, 1), (-1, -4), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -4), 10),
-                ('BACKGROUND', (0, -3), (-1, -1), colors.HexColor('#f5f5f5')),
-                ('FONTNAME', (0, -3), (-1, -1), 'Helvetica-Bold'),
-                ('LINEABOVE', (0, -3), (-1, -3), 1, colors.black),
-                ('LINEABOVE', (0, -1), (-1, -1), 1, colors.black),
-            ]))
-            
-            elements.append(table)
-            elements.append(Spacer(1, 30))
-            
-            # Add thank you message
-            thanks_style = ParagraphStyle(
-                'ThanksStyle',
-                parent=styles['Normal'],
-                fontSize=11,
-                spaceAfter=10,
-                alignment=1,
-                textColor=colors.HexColor(self.colors["primary"])
-            )
-            thanks = Paragraph("Thank you for dining at Spice Garden!", thanks_style)
-            elements.append(thanks)
-            
-            # Build PDF
-            doc.build(elements)
+            file_path = future.result()
             messagebox.showinfo("Success", f"Invoice saved as: {file_path}")
-            
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate PDF: {str(e)}")
+    
+    def show_day_report(self):
+        """Today's sales from the ledger: totals, categories and top items"""
+        today = date.today()
+        days = self.ledger.daily_sales(today, today)
+        if not days:
+            messagebox.showinfo("End of Day Report", "No sales recorded today.")
+            return
+        _, orders, subtotal, tax, total = days[0]
+        lines = [f"Date: {today.strftime('%d-%m-%Y')}",
+                 f"Orders: {orders}",
+                 f"Subtotal: {subtotal}",
+                 f"GST: {tax}",
+                 f"Total: {total}",
+                 "",
+                 "By category:"]
+        lines += [f"  {category}: {quantity} sold, {revenue}"
+                  for category, quantity, revenue in self.ledger.category_sales(today, today)]
+        lines += ["", "Top items:"]
+        lines += [f"  {name}: {quantity} sold, {revenue}"
+                  for _, name, quantity, revenue in self.ledger.item_sales(today, today, limit=5)]
+        messagebox.showinfo("End of Day Report", "\n".join(lines))
 
 def main():
     root = tk.Tk()
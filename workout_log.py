@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+from gym_analytics import WORKOUT_COLUMNS
+
+
+class WorkoutLog:
+    """Append-only workout log backed by typed, preallocated NumPy columns.
+
+    Appending a set writes one slot per column (capacity doubles when full),
+    so logging stays O(1) amortized. A DataFrame is only built when a page
+    asks for one, and is cached until the next append.
+    """
+
+    def __init__(self, capacity=256):
+        self._size = 0
+        self._dates = np.empty(capacity, dtype='datetime64[D]')
+        self._exercise_ids = np.empty(capacity, dtype=np.int32)
+        self._sets = np.empty(capacity, dtype=np.int32)
+        self._reps = np.empty(capacity, dtype=np.int32)
+        self._weight = np.empty(capacity, dtype=np.int32)
+        self._exercises = []        # exercise id -> name
+        self._exercise_ids_by_name = {}
+        self._frame = None
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def empty(self):
+        return self._size == 0
+
+    def _columns(self):
+        return ['_dates', '_exercise_ids', '_sets', '_reps', '_weight']
+
+    def _grow(self, needed):
+        capacity = max(len(self._dates), 1)  # Doubling from 0 would never grow
+        while capacity < needed:
+            capacity *= 2
+        for name in self._columns():
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def _exercise_id(self, exercise):
+        if exercise not in self._exercise_ids_by_name:
+            self._exercise_ids_by_name[exercise] = len(self._exercises)
+            self._exercises.append(exercise)
+        return self._exercise_ids_by_name[exercise]
+
+    def append(self, date, exercise, sets, reps, weight):
+        """Log one workout entry"""
+        if self._size == len(self._dates):
+            self._grow(self._size + 1)
+        i = self._size
+        self._dates[i] = np.datetime64(pd.Timestamp(date).date(), 'D')
+        self._exercise_ids[i] = self._exercise_id(exercise)
+        self._sets[i] = sets
+        self._reps[i] = reps
+        self._weight[i] = weight
+        self._size += 1
+        self._frame = None
+
+    def extend(self, frame):
+        """Bulk-append the rows of a DataFrame with the workout columns"""
+        count = len(frame)
+        if count == 0:
+            return
+        if self._size + count > len(self._dates):
+            self._grow(self._size + count)
+        start, end = self._size, self._size + count
+        self._dates[start:end] = pd.to_datetime(frame['date']).to_numpy().astype('datetime64[D]')
+        self._exercise_ids[start:end] = [self._exercise_id(name) for name in frame['exercise']]
+        self._sets[start:end] = frame['sets'].to_numpy()
+        self._reps[start:end] = frame['reps'].to_numpy()
+        self._weight[start:end] = frame['weight'].to_numpy()
+        self._size = end
+        self._frame = None
+
+    def recent(self, n):
+        """The n most recent entries as a list of dicts, without building a DataFrame"""
+        order = np.argsort(self._dates[:self._size], kind='stable')[::-1][:n]
+        return [{
+            'date': pd.Timestamp(self._dates[i]),
+            'exercise': self._exercises[self._exercise_ids[i]],
+            'sets': int(self._sets[i]),
+            'reps': int(self._reps[i]),
+            'weight': int(self._weight[i]),
+        } for i in order]
+
+    def to_frame(self):
+        """DataFrame view of the log (typed columns, cached until the next append)"""
+        if self._frame is None:
+            n = self._size
+            self._frame = pd.DataFrame({
+                'date': self._dates[:n].astype('datetime64[ns]'),
+                'exercise': pd.Categorical.from_codes(self._exercise_ids[:n],
+                                                      categories=self._exercises),
+                'sets': self._sets[:n].astype(np.int64),
+                'reps': self._reps[:n].astype(np.int64),
+                'weight': self._weight[:n].astype(np.int64),
+            }, columns=WORKOUT_COLUMNS)
+        return self._frame
@@ -0,0 +1,137 @@
+import sqlite3
+import threading
+
+import pandas as pd
+
+from gym_analytics import PRIndex
+from workout_log import WorkoutLog
+
+DB_FILE = "workouts.db"
+
+
+class WorkoutStore:
+    """Durable SQLite storage for logged sets, shared by every session.
+
+    Rows are indexed by (exercise, date) and by date, so the history
+    filters and the dashboard's date window run as indexed queries and only
+    the requested rows are loaded into memory.
+    """
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS workouts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    date TEXT NOT NULL,
+                    exercise TEXT NOT NULL,
+                    sets INTEGER NOT NULL,
+                    reps INTEGER NOT NULL,
+                    weight INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_workouts_exercise_date ON workouts (exercise, date);
+                CREATE INDEX IF NOT EXISTS idx_workouts_date ON workouts (date);
+            """)
+        self._pr_index = None
+        self._pr_last_id = 0  # Highest row id already in the PR index
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _catch_up(self):
+        """Index rows added since the last call, by this or another process (hold _lock).
+
+        The first call builds the index from the whole table in date order;
+        later calls only read rows past the last indexed id. Returns
+        {row id: records broken} for the rows added by a later call.
+        """
+        if self._pr_index is None:
+            self._pr_index = PRIndex()
+            for row_id, *row in self._conn.execute(
+                    "SELECT id, date, exercise, sets, reps, weight FROM workouts ORDER BY date, id"):
+                self._pr_index.add(*row)
+                self._pr_last_id = max(self._pr_last_id, row_id)
+            return {}
+        broken = {}
+        for row_id, *row in self._conn.execute(
+                "SELECT id, date, exercise, sets, reps, weight FROM workouts WHERE id > ? ORDER BY id",
+                (self._pr_last_id,)).fetchall():
+            broken[row_id] = self._pr_index.add(*row)
+            self._pr_last_id = row_id
+        return broken
+
+    @property
+    def pr_index(self):
+        """Personal-record index, including sets logged by other processes"""
+        with self._lock:
+            self._catch_up()
+            return self._pr_index
+
+    def add(self, date, exercise, sets, reps, weight):
+        """Persist one logged set and return the personal records it broke"""
+        with self._lock, self._conn:
+            self._catch_up()
+            row_id = self._conn.execute(
+                "INSERT INTO workouts (date, exercise, sets, reps, weight) VALUES (?, ?, ?, ?, ?)",
+                (pd.Timestamp(date).date().isoformat(), exercise, int(sets), int(reps), int(weight))
+            ).lastrowid
+            return self._catch_up().get(row_id, [])
+
+    def count(self):
+        return self._query("SELECT COUNT(*) FROM workouts")[0][0]
+
+    def date_bounds(self):
+        """(first, last) logged dates as Timestamps, or (None, None) when empty"""
+        first, last = self._query("SELECT MIN(date), MAX(date) FROM workouts")[0]
+        if first is None:
+            return None, None
+        return pd.Timestamp(first), pd.Timestamp(last)
+
+    def totals(self):
+        """(number of sets, total volume, most logged exercise) over all history"""
+        count, volume = self._query(
+            "SELECT COUNT(*), COALESCE(SUM(sets * reps * weight), 0) FROM workouts")[0]
+        favorite = self._query(
+            "SELECT exercise FROM workouts GROUP BY exercise ORDER BY COUNT(*) DESC, exercise LIMIT 1")
+        return count, volume, favorite[0][0] if favorite else "N/A"
+
+    def recent(self, n):
+        """The n most recently dated entries as a list of dicts"""
+        rows = self._query(
+            "SELECT date, exercise, sets, reps, weight FROM workouts "
+            "ORDER BY date DESC, id DESC LIMIT ?", (n,))
+        return [{'date': pd.Timestamp(date), 'exercise': exercise,
+                 'sets': sets, 'reps': reps, 'weight': weight}
+                for date, exercise, sets, reps, weight in rows]
+
+    def query(self, exercises=None, start_date=None, end_date=None):
+        """Load only the matching rows into a WorkoutLog.
+
+        exercises=None means all exercises; missing dates leave that side open.
+        """
+        clauses, params = [], []
+        if exercises is not None:
+            exercises = list(exercises)
+            if not exercises:
+                return WorkoutLog()
+            clauses.append(f"exercise IN ({', '.join('?' * len(exercises))})")
+            params.extend(exercises)
+        if start_date is not None:
+            clauses.append("date >= ?")
+            params.append(pd.Timestamp(start_date).date().isoformat())
+        if end_date is not None:
+            clauses.append("date <= ?")
+            params.append(pd.Timestamp(end_date).date().isoformat())
+
+        sql = "SELECT date, exercise, sets, reps, weight FROM workouts"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        rows = self._query(sql + " ORDER BY date, id", params)
+
+        log = WorkoutLog(capacity=max(len(rows), 1))
+        log.extend(pd.DataFrame(rows, columns=['date', 'exercise', 'sets', 'reps', 'weight']))
+        return log